@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+from django.core.cache import caches
+from django.db import models
+
+CALENDAR_CACHE_ALIAS = "calendars"
+
+
+def get_calendar_cache():
+    """Return the cache backend used for rendered calendar payloads."""
+    return caches[CALENDAR_CACHE_ALIAS]
+
+
+def _version_key(user_id):
+    return f"calendar:{user_id}:version"
+
+
+def _payload_key(user_id, version, view_type, period):
+    return f"calendar:{user_id}:{version}:{view_type}:{period}"
+
+
+def calendar_cache_key(user_id, view_type, period):
+    """
+    Build the cache key of a calendar payload for (user, view, period).
+    Keys include a per-user version, so all payloads of a user can be dropped at once.
+    A lost version is replaced by a new random one, which never resurrects stale payloads.
+    """
+    version = get_calendar_cache().get_or_set(_version_key(user_id), lambda: uuid4().hex, timeout=None)
+    return _payload_key(user_id, version, view_type, period)
+
+
+def invalidate_calendar(entries):
+    """
+    Drop cached day and month payloads for the given (user_id, date) pairs.
+    Dates may be passed as strings, they are normalized the same way the model field does it.
+    A date of None drops all cached payloads of the user, e.g. for recurring meetings.
+    """
+    cache = get_calendar_cache()
+    dates_by_user = {}
+    for user_id, date in entries:
+        if user_id is not None:
+            dates_by_user.setdefault(user_id, set()).add(date)
+
+    whole_calendars = [user_id for user_id, dates in dates_by_user.items() if None in dates]
+    if whole_calendars:
+        cache.set_many({_version_key(user_id): uuid4().hex for user_id in whole_calendars}, timeout=None)
+
+    versions = cache.get_many([_version_key(user_id) for user_id in dates_by_user if user_id not in whole_calendars])
+    keys = set()
+    for user_id, dates in dates_by_user.items():
+        version = versions.get(_version_key(user_id))
+        if version is None:
+            continue
+        for date in dates:
+            date = models.DateField().to_python(date)
+            keys.add(_payload_key(user_id, version, "day", date.isoformat()))
+            keys.add(_payload_key(user_id, version, "month", date.strftime("%Y-%m")))
+
+    if keys:
+        cache.delete_many(keys)
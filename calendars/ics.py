@@ -0,0 +1,163 @@
+import hashlib
+import uuid
+from datetime import timezone as dt_timezone
+
+from django.core import signing
+from django.db.models import Count, Max
+
+from calendars.models import CalendarFeed
+from meetings.models import Meeting, MeetingRecurrence, meeting_period
+from tasks.models import Task, TaskStatus
+
+FEED_TOKEN_SALT = "calendars.feed"
+
+ICS_DOMAIN = "businessmanagement"
+ICS_RECURRENCE = {
+    MeetingRecurrence.DAILY: "DAILY",
+    MeetingRecurrence.WEEKLY: "WEEKLY",
+}
+ICS_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n"})
+ICS_TASK_STATUS = {
+    TaskStatus.OPEN: "NEEDS-ACTION",
+    TaskStatus.IN_PROGRESS: "IN-PROCESS",
+    TaskStatus.COMPLETED: "COMPLETED",
+}
+
+
+def _escape(text):
+    """Escape a TEXT value."""
+    return (text or "").replace("\r\n", "\n").translate(ICS_TEXT_ESCAPES)
+
+
+def _utc(moment):
+    """Format an aware datetime as a UTC DATE-TIME value."""
+    return moment.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _line(name, value):
+    """Build a content line folded to 75 octets, continuation lines start with a space."""
+    chunks, chunk, size = [], "", 0
+    for char in f"{name}:{value}":
+        char_size = len(char.encode())
+        if size + char_size > 75:
+            chunks.append(chunk)
+            chunk, size = " ", 1
+        chunk += char
+        size += char_size
+    chunks.append(chunk)
+    return "\r\n".join(chunks) + "\r\n"
+
+
+def _meeting_event(meeting, date, start_time, end_time, recurrence_id=None):
+    """Return the lines of a VEVENT of the meeting without its END line."""
+    period = meeting_period(date, start_time, end_time)
+    lines = [
+        "BEGIN:VEVENT\r\n",
+        _line("UID", f"meeting-{meeting.pk}@{ICS_DOMAIN}"),
+        _line("DTSTAMP", _utc(meeting.updated_at)),
+        _line("DTSTART", _utc(period.lower)),
+        _line("DTEND", _utc(period.upper)),
+        _line("SUMMARY", _escape(meeting.title)),
+    ]
+    if meeting.description:
+        lines.append(_line("DESCRIPTION", _escape(meeting.description)))
+    if recurrence_id:
+        lines.append(_line("RECURRENCE-ID", _utc(recurrence_id)))
+    return lines
+
+
+def meeting_to_ics(meeting):
+    """
+    Render the meeting as VEVENT components.
+    A recurring meeting is one event with a rule, cancelled occurrences are excluded
+    and moved occurrences override the rule with their own events. Exceptions should be prefetched.
+    """
+    lines = _meeting_event(meeting, meeting.date, meeting.start_time, meeting.end_time)
+    exceptions = list(meeting.exceptions.all()) if meeting.is_recurring else []
+    if meeting.is_recurring:
+        rule = f"FREQ={ICS_RECURRENCE[meeting.recurrence]};INTERVAL={meeting.recurrence_interval}"
+        if meeting.recurrence_until:
+            until = meeting_period(meeting.recurrence_until, meeting.start_time, meeting.end_time).lower
+            rule += f";UNTIL={_utc(until)}"
+        lines.append(_line("RRULE", rule))
+        for exception in exceptions:
+            if exception.is_cancelled:
+                original = meeting_period(exception.original_date, meeting.start_time, meeting.end_time).lower
+                lines.append(_line("EXDATE", _utc(original)))
+    lines.append("END:VEVENT\r\n")
+
+    for exception in exceptions:
+        if exception.is_cancelled:
+            continue
+        lines += _meeting_event(
+            meeting,
+            exception.date or exception.original_date,
+            exception.start_time or meeting.start_time,
+            exception.end_time or meeting.end_time,
+            recurrence_id=meeting_period(exception.original_date, meeting.start_time, meeting.end_time).lower,
+        )
+        lines.append("END:VEVENT\r\n")
+    return "".join(lines)
+
+
+def task_to_ics(task):
+    """Render the task as a VTODO component due on its deadline."""
+    lines = [
+        "BEGIN:VTODO\r\n",
+        _line("UID", f"task-{task.pk}@{ICS_DOMAIN}"),
+        _line("DTSTAMP", _utc(task.updated_at)),
+        _line("DUE;VALUE=DATE", task.deadline.strftime("%Y%m%d")),
+        _line("SUMMARY", _escape(task.title)),
+        _line("STATUS", ICS_TASK_STATUS.get(task.status, "NEEDS-ACTION")),
+    ]
+    if task.description:
+        lines.append(_line("DESCRIPTION", _escape(task.description)))
+    lines.append("END:VTODO\r\n")
+    return "".join(lines)
+
+
+def iter_calendar_ics(meetings, tasks):
+    """Yield the iCalendar document chunk by chunk, one component at a time."""
+    yield f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//{ICS_DOMAIN}//Calendar//RU\r\nCALSCALE:GREGORIAN\r\n"
+    for meeting in meetings:
+        yield meeting_to_ics(meeting)
+    for task in tasks:
+        yield task_to_ics(task)
+    yield "END:VCALENDAR\r\n"
+
+
+def _sign_feed(feed):
+    return signing.dumps({"user": feed.user_id, "key": feed.key.hex}, salt=FEED_TOKEN_SALT)
+
+
+def make_feed_token(user_id):
+    """Return the secret token of the user's calendar feed URL, external calendar clients cannot log in."""
+    feed, _ = CalendarFeed.objects.get_or_create(user_id=user_id)
+    return _sign_feed(feed)
+
+
+def reset_feed_token(user_id):
+    """Replace the key of the user's feed, so every feed URL issued before stops working, return the new token."""
+    feed, _ = CalendarFeed.objects.update_or_create(user_id=user_id, defaults={"key": uuid.uuid4()})
+    return _sign_feed(feed)
+
+
+def read_feed_token(token):
+    """Return the id of the user the feed token belongs to, None if the token is invalid or revoked."""
+    try:
+        data = signing.loads(token, salt=FEED_TOKEN_SALT)
+        user_id, key = data["user"], uuid.UUID(data["key"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+    return user_id if CalendarFeed.objects.filter(user_id=user_id, key=key).exists() else None
+
+
+def calendar_feed_etag(user_id):
+    """
+    Return the version of the user's feed computed by the database without loading the entries.
+    Any change, added or removed entry changes the number of entries or their latest update time.
+    """
+    meetings = Meeting.objects.filter(participants=user_id).aggregate(count=Count("pk"), updated_at=Max("updated_at"))
+    tasks = Task.objects.filter(task_performer=user_id).aggregate(count=Count("pk"), updated_at=Max("updated_at"))
+    version = f"{meetings['count']}:{meetings['updated_at']}:{tasks['count']}:{tasks['updated_at']}"
+    return hashlib.md5(version.encode(), usedforsecurity=False).hexdigest()
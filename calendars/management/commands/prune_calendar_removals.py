@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from calendars.sync import prune_calendar_removals
+
+
+class Command(BaseCommand):
+    """
+    The command to delete calendar removals no sync token can reach anymore.
+    Tokens older than SYNC_TOKEN_MAX_AGE are rejected, so older removals are never read again.
+    """
+
+    help = "Delete calendar removals older than the maximum age of a sync token."
+
+    def handle(self, *args, **options):
+        deleted = prune_calendar_removals()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired calendar removal(s)."))
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CalendarRemoval",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entry_type",
+                    models.CharField(
+                        choices=[("meeting", "Meeting"), ("task", "Task")],
+                        max_length=20,
+                        verbose_name="Тип записи",
+                    ),
+                ),
+                ("entry_id", models.PositiveBigIntegerField(verbose_name="ID записи")),
+                (
+                    "removed_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата удаления"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="calendar_removals",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Удаление из календаря",
+                "verbose_name_plural": "Удаления из календаря",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "removed_at"], name="calendar_removal_user_time"
+                    )
+                ],
+            },
+        ),
+    ]
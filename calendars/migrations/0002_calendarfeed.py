@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:19
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calendars", "0001_initial"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CalendarFeed",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="calendar_feed",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+                ("key", models.UUIDField(default=uuid.uuid4, verbose_name="Ключ фида")),
+            ],
+            options={
+                "verbose_name": "Фид календаря",
+                "verbose_name_plural": "Фиды календаря",
+            },
+        ),
+    ]
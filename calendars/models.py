@@ -1,3 +1,58 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+from config import settings
+
+
+class CalendarEntryType(models.TextChoices):
+    MEETING = "meeting", "Meeting"
+    TASK = "task", "Task"
+
+
+class CalendarRemoval(models.Model):
+    """
+    Meeting or task that left the calendar of a user: deleted, or the user is no longer its participant or performer.
+    Changed entries are found by their updated_at, removals are only visible through this log.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="calendar_removals",
+        verbose_name="Пользователь",
+    )
+    entry_type = models.CharField(max_length=20, choices=CalendarEntryType.choices, verbose_name="Тип записи")
+    entry_id = models.PositiveBigIntegerField(verbose_name="ID записи")
+    removed_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата удаления")
+
+    class Meta:
+        verbose_name = "Удаление из календаря"
+        verbose_name_plural = "Удаления из календаря"
+        indexes = [
+            models.Index(fields=["user", "removed_at"], name="calendar_removal_user_time"),
+        ]
+
+    def __str__(self):
+        return f"{self.entry_type} {self.entry_id} - {self.user}"
+
+
+class CalendarFeed(models.Model):
+    """
+    Secret key of the iCalendar feed of a user, signed into the feed URL.
+    Replacing the key revokes every feed URL issued before.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="calendar_feed",
+        verbose_name="Пользователь",
+    )
+    key = models.UUIDField(default=uuid.uuid4, verbose_name="Ключ фида")
+
+    class Meta:
+        verbose_name = "Фид календаря"
+        verbose_name_plural = "Фиды календаря"
+
+    def __str__(self):
+        return f"{self.user}"
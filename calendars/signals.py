@@ -0,0 +1,206 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from calendars.cache import invalidate_calendar
+from calendars.models import CalendarEntryType, CalendarRemoval
+from meetings.models import Meeting, MeetingException, MeetingParticipant, MeetingRecurrence
+from meetings.signals import meetings_bulk_created
+from tasks.models import Task
+from tasks.signals import tasks_bulk_saved
+
+
+def _invalidate_on_commit(entries):
+    """Invalidate cached calendars once the surrounding transaction is committed."""
+    transaction.on_commit(partial(invalidate_calendar, set(entries)))
+
+
+def _calendar_date(date, recurrence):
+    """Return the date to invalidate, None means every date for recurring meetings."""
+    return None if recurrence != MeetingRecurrence.NONE else date
+
+
+def _meeting_entries(meeting_ids):
+    """Return (user_id, date) pairs for all participants of the given meetings."""
+    participants = MeetingParticipant.objects.filter(meeting_id__in=meeting_ids).values_list(
+        "user_id", "meeting__date", "meeting__recurrence"
+    )
+    return [(user_id, _calendar_date(date, recurrence)) for user_id, date, recurrence in participants]
+
+
+def _log_removals(entry_type, entries):
+    """Log (user_id, entry_id) pairs of entries that left the users calendars for calendar sync."""
+    CalendarRemoval.objects.bulk_create(
+        CalendarRemoval(user_id=user_id, entry_type=entry_type, entry_id=entry_id)
+        for user_id, entry_id in entries
+        if user_id
+    )
+
+
+def _touch_meetings(meeting_ids):
+    """Mark meetings changed for calendar sync without sending their signals."""
+    Meeting.objects.filter(pk__in=meeting_ids).update(updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=Meeting)
+def remember_meeting_date(sender, instance, **kwargs):
+    """Keep the stored date of a meeting to invalidate it if the meeting is moved."""
+    if instance.pk:
+        previous = Meeting.objects.filter(pk=instance.pk).values_list("date", "recurrence").first()
+        instance._calendar_previous_date = _calendar_date(*previous) if previous else None
+
+
+@receiver(post_save, sender=Meeting)
+def invalidate_meeting_calendars(sender, instance, created, **kwargs):
+    """Invalidate calendars of the meeting participants when the meeting changes."""
+    if created:
+        return
+
+    entries = _meeting_entries([instance.pk])
+    previous_date = getattr(instance, "_calendar_previous_date", None)
+    entries += [(user_id, previous_date) for user_id, _ in entries]
+    _invalidate_on_commit(entries)
+
+
+@receiver(pre_delete, sender=Meeting)
+def invalidate_deleted_meeting_calendars(sender, instance, **kwargs):
+    """Invalidate calendars of the participants before their links are removed."""
+    _invalidate_on_commit(_meeting_entries([instance.pk]))
+
+
+@receiver(m2m_changed, sender=MeetingParticipant)
+def invalidate_participants_calendars(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invalidate calendars when meeting participants change.
+    Every participant sees the list of participants, so all of them are invalidated.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if reverse:
+        meeting_ids = set(pk_set or ())
+        if action == "pre_clear":
+            meeting_ids = set(instance.meetings.values_list("pk", flat=True))
+        meetings = Meeting.objects.filter(pk__in=meeting_ids).values_list("date", "recurrence")
+        entries = [(instance.pk, _calendar_date(date, recurrence)) for date, recurrence in meetings]
+        entries += _meeting_entries(meeting_ids)
+    else:
+        entries = _meeting_entries([instance.pk])
+        entries += [(user_id, _calendar_date(instance.date, instance.recurrence)) for user_id in pk_set or ()]
+
+    _invalidate_on_commit(entries)
+
+
+@receiver(meetings_bulk_created, sender=Meeting)
+def invalidate_bulk_created_meetings_calendars(sender, meetings, participants, **kwargs):
+    """Invalidate calendars of the participants of meetings created in bulk."""
+    _invalidate_on_commit(
+        (user_id, meeting.date) for meeting in meetings for user_id in participants[meeting.pk]
+    )
+
+
+@receiver(post_save, sender=MeetingException)
+@receiver(post_delete, sender=MeetingException)
+def invalidate_meeting_exception_calendars(sender, instance, **kwargs):
+    """Invalidate calendars of the participants when an occurrence of a recurring meeting changes."""
+    _invalidate_on_commit(
+        (user_id, None) for user_id in instance.meeting.participants.values_list("pk", flat=True)
+    )
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_schedule(sender, instance, **kwargs):
+    """Keep the stored performer and deadline of a task to invalidate them if they change."""
+    if instance.pk:
+        instance._calendar_previous_entry = (
+            Task.objects.filter(pk=instance.pk).values_list("task_performer_id", "deadline").first()
+        )
+
+
+@receiver(post_save, sender=Task)
+def invalidate_task_calendars(sender, instance, **kwargs):
+    """Invalidate calendars of the previous and the current task performer."""
+    entries = [(instance.task_performer_id, instance.deadline)]
+    previous_entry = getattr(instance, "_calendar_previous_entry", None)
+    if previous_entry:
+        entries.append(previous_entry)
+    _invalidate_on_commit(entries)
+
+
+@receiver(post_delete, sender=Task)
+def invalidate_deleted_task_calendars(sender, instance, **kwargs):
+    """Invalidate the calendar of the performer of a deleted task."""
+    _invalidate_on_commit([(instance.task_performer_id, instance.deadline)])
+
+
+@receiver(pre_delete, sender=Meeting)
+def log_deleted_meeting_removals(sender, instance, **kwargs):
+    """Log the deleted meeting as removed from the calendars of its participants."""
+    user_ids = MeetingParticipant.objects.filter(meeting=instance).values_list("user_id", flat=True)
+    _log_removals(CalendarEntryType.MEETING, [(user_id, instance.pk) for user_id in user_ids])
+
+
+@receiver(m2m_changed, sender=MeetingParticipant)
+def track_participants_changes(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Mark meetings changed when their participants change and log removed participants.
+    Every participant sees the list of participants, so the meeting changes for all of them.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if reverse:
+        meeting_ids = set(pk_set or ())
+        if action == "pre_clear":
+            meeting_ids = set(instance.meetings.values_list("pk", flat=True))
+        removals = [(instance.pk, meeting_id) for meeting_id in meeting_ids]
+    else:
+        meeting_ids = {instance.pk}
+        user_ids = pk_set or ()
+        if action == "pre_clear":
+            user_ids = instance.participants.values_list("pk", flat=True)
+        removals = [(user_id, instance.pk) for user_id in user_ids]
+
+    _touch_meetings(meeting_ids)
+    if action != "post_add":
+        _log_removals(CalendarEntryType.MEETING, removals)
+
+
+@receiver(post_save, sender=MeetingException)
+@receiver(post_delete, sender=MeetingException)
+def touch_meeting_of_exception(sender, instance, **kwargs):
+    """Mark the recurring meeting changed when one of its occurrences changes."""
+    _touch_meetings([instance.meeting_id])
+
+
+@receiver(post_save, sender=Task)
+def log_reassigned_task_removal(sender, instance, **kwargs):
+    """Log the task as removed from the calendar of its previous performer."""
+    previous_entry = getattr(instance, "_calendar_previous_entry", None)
+    if previous_entry and previous_entry[0] != instance.task_performer_id:
+        _log_removals(CalendarEntryType.TASK, [(previous_entry[0], instance.pk)])
+
+
+@receiver(post_delete, sender=Task)
+def log_deleted_task_removal(sender, instance, **kwargs):
+    """Log the deleted task as removed from the calendar of its performer."""
+    _log_removals(CalendarEntryType.TASK, [(instance.task_performer_id, instance.pk)])
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def track_bulk_saved_tasks(sender, tasks, previous, **kwargs):
+    """Invalidate calendars of the previous and the current performers of tasks saved in bulk."""
+    _invalidate_on_commit(
+        [(task.task_performer_id, task.deadline) for task in tasks] + list(previous.values())
+    )
+    _log_removals(
+        CalendarEntryType.TASK,
+        [
+            (previous[task.pk][0], task.pk)
+            for task in tasks
+            if task.pk in previous and previous[task.pk][0] != task.task_performer_id
+        ],
+    )
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+from django.core import signing
+from django.utils import timezone
+
+from calendars.models import CalendarEntryType, CalendarRemoval
+from meetings.models import Meeting
+from meetings.recurrence import expand_occurrences
+from meetings.serializers import serialize_occurrences
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+
+SYNC_TOKEN_SALT = "calendars.sync"
+SYNC_TOKEN_MAX_AGE = timedelta(days=30)
+# Changes saved by transactions still running when a token is issued are committed a bit later,
+# so every token also covers a short period before it was issued.
+SYNC_TOKEN_OVERLAP = timedelta(seconds=30)
+
+
+def make_sync_token(user_id):
+    """Return the token a client sends to get the changes of its calendar made after this moment."""
+    since = timezone.now() - SYNC_TOKEN_OVERLAP
+    return signing.dumps({"user": user_id, "since": since.isoformat()}, salt=SYNC_TOKEN_SALT)
+
+
+def read_sync_token(token, user_id):
+    """Return the moment the token was issued at, None if the token is invalid or too old to sync from."""
+    try:
+        data = signing.loads(token, salt=SYNC_TOKEN_SALT)
+        since = datetime.fromisoformat(data["since"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+    if data.get("user") != user_id or timezone.now() - since > SYNC_TOKEN_MAX_AGE:
+        return None
+    return since
+
+
+def prune_calendar_removals():
+    """Delete removals older than any valid sync token can ask for, return the number of deleted rows."""
+    expired_before = timezone.now() - SYNC_TOKEN_MAX_AGE - SYNC_TOKEN_OVERLAP
+    deleted, _ = CalendarRemoval.objects.filter(removed_at__lt=expired_before).delete()
+    return deleted
+
+
+def build_calendar_changes(user, start_date, end_date, since):
+    """
+    Collect meetings and tasks of the user's calendar changed in the date range since the given moment.
+    Changed entries replace all the client's entries with the same id, entries with removed ids are dropped.
+    A changed entry that moved out of the range is reported as removed.
+    """
+    meetings = Meeting.objects.filter(participants=user, updated_at__gte=since).prefetch_related(
+        "participants", "exceptions"
+    )
+    occurrences = expand_occurrences(meetings, start_date, end_date)
+    tasks = Task.objects.filter(task_performer=user, updated_at__gte=since)
+    tasks_in_range = [task for task in tasks if start_date <= task.deadline <= end_date]
+
+    removed = {CalendarEntryType.MEETING: set(), CalendarEntryType.TASK: set()}
+    removals = CalendarRemoval.objects.filter(user=user, removed_at__gte=since)
+    for entry_type, entry_id in removals.values_list("entry_type", "entry_id"):
+        removed[entry_type].add(entry_id)
+    removed[CalendarEntryType.MEETING] |= {meeting.pk for meeting in meetings}
+    removed[CalendarEntryType.MEETING] -= {occurrence.meeting.pk for occurrence in occurrences}
+    removed[CalendarEntryType.TASK] |= {task.pk for task in tasks}
+    removed[CalendarEntryType.TASK] -= {task.pk for task in tasks_in_range}
+
+    return {
+        "meetings": serialize_occurrences(occurrences),
+        "tasks": TaskSerializer(tasks_in_range, many=True).data,
+        "removed": {
+            "meetings": sorted(removed[CalendarEntryType.MEETING]),
+            "tasks": sorted(removed[CalendarEntryType.TASK]),
+        },
+    }
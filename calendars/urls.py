@@ -1,10 +1,12 @@
 from django.urls import path
 
 from calendars.apps import CalendarsConfig
-from calendars.views import CalendarAPIView
+from calendars.views import CalendarAPIView, CalendarFeedLinkAPIView, CalendarFeedView
 
 app_name = CalendarsConfig.name
 
 urlpatterns = [
     path("calendar/", CalendarAPIView.as_view(), name="calendar"),
+    path("feed/", CalendarFeedLinkAPIView.as_view(), name="feed_link"),
+    path("feed/<str:token>/calendar.ics", CalendarFeedView.as_view(), name="feed"),
 ]
\ No newline at end of file
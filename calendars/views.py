@@ -1,22 +1,74 @@
 from calendar import monthrange
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from django.db.models import Q
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
 from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import etag
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from calendars.cache import calendar_cache_key, get_calendar_cache
+from calendars.ics import (calendar_feed_etag, iter_calendar_ics, make_feed_token, read_feed_token,
+                           reset_feed_token)
+from calendars.sync import build_calendar_changes, make_sync_token, read_sync_token
 from meetings.models import Meeting
-from meetings.serializers import MeetingSerializer
+from meetings.recurrence import expand_occurrences, occurs_within
+from meetings.serializers import serialize_occurrences
 from tasks.models import Task
 from tasks.serializers import TaskSerializer
 
 
+def build_calendar(user, start_date, end_date):
+    """
+    Collect user's meetings and tasks for the date range grouped by day.
+    Meetings and tasks are fetched once each and bucketed in memory,
+    so the number of queries does not depend on the length of the range.
+    Recurring meetings are expanded into occurrences only within the range.
+    """
+    meetings = Meeting.objects.filter(
+        Q(participations__user=user) & occurs_within(start_date, end_date, "participations__date")
+    ).prefetch_related("participants", "exceptions")
+    tasks = Task.objects.filter(
+        task_performer=user, deadline__range=(start_date, end_date)
+    )
+
+    calendar_data = {}
+    day_date = start_date
+    while day_date <= end_date:
+        calendar_data[str(day_date)] = {"meetings": [], "tasks": []}
+        day_date += timedelta(days=1)
+
+    for meeting in serialize_occurrences(expand_occurrences(meetings, start_date, end_date)):
+        calendar_data[meeting["date"]]["meetings"].append(meeting)
+    for task in TaskSerializer(tasks, many=True).data:
+        calendar_data[task["deadline"]]["tasks"].append(task)
+
+    return calendar_data
+
+
 class CalendarAPIView(APIView):
-    """API view to display user's tasks and meetings in calendar format."""
+    """
+    API view to display user's tasks and meetings in calendar format.
+    Every response carries a sync token, given a previous token only the changes made since it are returned.
+    """
 
     def get(self, request):
         user = request.user
         view_type = request.query_params.get("view", "day")
+        # Issued before anything is read, so changes made during the request are returned next time.
+        sync_token = make_sync_token(user.pk)
+
+        since = None
+        if "sync_token" in request.query_params:
+            since = read_sync_token(request.query_params["sync_token"], user.pk)
+            if since is None:
+                return Response(
+                    {"error": "Токен синхронизации недействителен, загрузите календарь заново."}, status=410
+                )
 
         if view_type == "day":
             date_str = request.query_params.get("date")
@@ -31,17 +83,17 @@ class CalendarAPIView(APIView):
                     {"error": "Неверный формат даты."}, status=400
                 )
 
-            meetings = Meeting.objects.filter(participants=user, date=date)
-            tasks = Task.objects.filter(task_performer=user, deadline=date)
+            if since:
+                changes = build_calendar_changes(user, date, date, since)
+                return Response({"date": date_str, "sync_token": sync_token, **changes})
 
-            return Response(
-                {
-                    "date": date_str,
-                    "meetings": MeetingSerializer(meetings, many=True).data,
-                    "tasks": TaskSerializer(tasks, many=True).data,
-                }
+            day_data = get_calendar_cache().get_or_set(
+                calendar_cache_key(user.pk, "day", date.isoformat()),
+                lambda: build_calendar(user, date, date)[str(date)],
             )
 
+            return Response({"date": date_str, "sync_token": sync_token, **day_data})
+
         elif view_type == "month":
             month_str = request.query_params.get("month")
             if not month_str:
@@ -56,25 +108,67 @@ class CalendarAPIView(APIView):
             except (ValueError, IndexError):
                 return Response({"error": "Неверный формат даты."}, status=400)
 
-            meetings = Meeting.objects.filter(
-                participants=user, date__range=(start_date, end_date)
-            )
-            tasks = Task.objects.filter(
-                task_performer=user, deadline__range=(start_date, end_date)
-            )
+            if since:
+                changes = build_calendar_changes(user, start_date, end_date, since)
+                return Response({"month": month_str, "sync_token": sync_token, **changes})
 
-            calendar_data = {}
-            for day in range(1, monthrange(year, month)[1] + 1):
-                day_date = datetime(year, month, day).date()
-                calendar_data[str(day_date)] = {
-                    "meetings": MeetingSerializer(
-                        meetings.filter(date=day_date), many=True
-                    ).data,
-                    "tasks": TaskSerializer(
-                        tasks.filter(deadline=day_date), many=True
-                    ).data,
-                }
+            calendar_data = get_calendar_cache().get_or_set(
+                calendar_cache_key(user.pk, "month", start_date.strftime("%Y-%m")),
+                lambda: build_calendar(user, start_date, end_date),
+            )
 
-            return Response({"month": month_str, "calendar": calendar_data})
+            return Response({"month": month_str, "sync_token": sync_token, "calendar": calendar_data})
 
         return Response({"error": "Введены неверные параметры."}, status=400)
+
+
+class CalendarFeedLinkAPIView(APIView):
+    """
+    API view to get the secret iCalendar feed URL of the user for external calendar clients.
+    POST issues a new URL and revokes the previous ones, e.g. when a URL has leaked.
+    """
+
+    def get(self, request):
+        return self._feed_link(request, make_feed_token(request.user.pk))
+
+    def post(self, request):
+        return self._feed_link(request, reset_feed_token(request.user.pk))
+
+    @staticmethod
+    def _feed_link(request, token):
+        url = reverse("calendar:feed", args=(token,))
+        return Response({"url": request.build_absolute_uri(url)})
+
+
+def _feed_etag(request, token):
+    user_id = read_feed_token(token)
+    return calendar_feed_etag(user_id) if user_id else None
+
+
+@method_decorator(etag(_feed_etag), name="get")
+class CalendarFeedView(View):
+    """
+    iCalendar feed of user's meetings and tasks.
+    Entries are streamed from the database in chunks, so memory does not grow with the history,
+    and an unchanged feed is answered with 304 by its ETag.
+    """
+
+    meetings_chunk_size = 500
+    tasks_chunk_size = 2000
+
+    def get(self, request, token):
+        user_id = read_feed_token(token)
+        if not user_id:
+            raise Http404
+
+        meetings = (
+            Meeting.objects.filter(participants=user_id)
+            .order_by("pk")
+            .prefetch_related("exceptions")
+            .iterator(chunk_size=self.meetings_chunk_size)
+        )
+        tasks = Task.objects.filter(task_performer=user_id).order_by("pk").iterator(chunk_size=self.tasks_chunk_size)
+
+        response = StreamingHttpResponse(iter_calendar_ics(meetings, tasks), content_type="text/calendar; charset=utf-8")
+        response["Content-Disposition"] = 'inline; filename="calendar.ics"'
+        return response
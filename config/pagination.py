@@ -0,0 +1,115 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, time
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorPagination(BasePagination):
+    """
+    Base of the keyset paginations: the cursor keeps the position of the last item of the page
+    as "|"-separated values, subclasses convert the position from and to the cursor.
+    """
+
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    next_item = None
+
+    def get_page_size(self, request):
+        """Return the requested page size limited by max_page_size."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def read_cursor(self, request, size):
+        """Return the size values of the position encoded in the cursor, None without a cursor."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = urlsafe_b64decode(encoded.encode()).decode().rsplit("|", size - 1)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if len(values) != size:
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def write_cursor(self, *values):
+        """Encode the values of a position into the cursor."""
+        return urlsafe_b64encode("|".join(str(value) for value in values).encode()).decode()
+
+    def decode_cursor(self, request):
+        """Return the position encoded in the cursor, None without a cursor."""
+        raise NotImplementedError
+
+    def encode_cursor(self, item):
+        """Encode the position of the item into the cursor."""
+        raise NotImplementedError
+
+    def get_next_link(self):
+        if self.next_item is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_item))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination ordered by ordering_field, then by id.
+    The cursor keeps the position of the last object of the page, so every page is a range scan
+    of an (ordering_field, id) index, however deep it is.
+    """
+
+    ordering_field = None
+    descending = False
+
+    def parse_value(self, value):
+        """Parse the ordering field value stored in the cursor."""
+        return value
+
+    def format_value(self, value):
+        """Format the ordering field value to be stored in the cursor, dates and times in ISO 8601."""
+        return value.isoformat() if isinstance(value, (date, time)) else str(value)
+
+    def decode_cursor(self, request):
+        """Return the (ordering field value, id) position encoded in the cursor."""
+        values = self.read_cursor(request, 2)
+        if values is None:
+            return None
+        try:
+            return self.parse_value(values[0]), int(values[1])
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance):
+        """Encode the position of the object into the cursor."""
+        return self.write_cursor(self.format_value(getattr(instance, self.ordering_field)), instance.pk)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        field, before = self.ordering_field, "lt" if self.descending else "gt"
+        if position:
+            value, object_id = position
+            # The redundant inclusive bound lets the database start the index scan at the cursor.
+            queryset = queryset.filter(
+                Q(**{f"{field}__{before}e": value}),
+                Q(**{f"{field}__{before}": value}) | Q(**{f"pk__{before}": object_id}),
+            )
+
+        ordering = (f"-{field}", "-pk") if self.descending else (field, "pk")
+        page = list(queryset.order_by(*ordering)[: page_size + 1])
+        self.next_item = page[page_size - 1] if len(page) > page_size else None
+        return page[:page_size]
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'django_extensions',
@@ -86,6 +87,39 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "calendars": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "calendars",
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+            "CULL_FREQUENCY": 4,
+        },
+    },
+    "evaluations": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "evaluations",
+        "TIMEOUT": 5 * 60,
+    },
+}
+
+if os.getenv("REDIS_URL"):
+    CACHES["calendars"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+        "TIMEOUT": 60 * 60,
+        "KEY_PREFIX": "calendars",
+    }
+    CACHES["evaluations"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+        "TIMEOUT": 5 * 60,
+        "KEY_PREFIX": "evaluations",
+    }
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -0,0 +1,25 @@
+from uuid import uuid4
+
+from django.core.cache import caches
+
+EVALUATION_CACHE_ALIAS = "evaluations"
+LEADERBOARD_VERSION_KEY = "leaderboard:version"
+
+
+def get_evaluation_cache():
+    """Return the cache backend used for leaderboards."""
+    return caches[EVALUATION_CACHE_ALIAS]
+
+
+def leaderboard_cache_key(team_id, start, end, limit):
+    """
+    Build the cache key of a leaderboard.
+    Keys include a shared version, so all leaderboards are dropped at once when any score changes.
+    """
+    version = get_evaluation_cache().get_or_set(LEADERBOARD_VERSION_KEY, lambda: uuid4().hex, timeout=None)
+    return f"leaderboard:{version}:{team_id}:{start}:{end}:{limit}"
+
+
+def invalidate_leaderboards():
+    """Drop all cached leaderboards, the rest expire by the cache timeout."""
+    get_evaluation_cache().set(LEADERBOARD_VERSION_KEY, uuid4().hex, timeout=None)
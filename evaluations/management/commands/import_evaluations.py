@@ -0,0 +1,81 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from evaluations.serializers import EvaluationImportSerializer
+from evaluations.services import upsert_evaluations
+
+
+class Command(BaseCommand):
+    """
+    The command to import evaluations of a review cycle from a CSV or JSON Lines file.
+    Rows are streamed from the file and upserted in batches, so an evaluation of a task by the same author
+    replaces the stored one.
+    """
+
+    help = "Import evaluations (task, author, score, comment) from a CSV or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with a header or JSON Lines file, one evaluation per row.")
+        parser.add_argument(
+            "--format", choices=("csv", "jsonl"), help="File format, taken from the extension by default."
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Evaluations written at once.")
+
+    @staticmethod
+    def _rows(file, file_format):
+        """Yield rows of the file one by one, a line that is not valid JSON is left to the validation."""
+        if file_format == "csv":
+            yield from csv.DictReader(file)
+            return
+        for line in file:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield line
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        file_format = options["format"] or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+        if options["batch_size"] < 1:
+            raise CommandError("Batch size must be positive.")
+
+        self.inserted = self.updated = self.rejected = 0
+        try:
+            with path.open(newline="", encoding="utf-8") as file:
+                batch = []
+                for number, row in enumerate(self._rows(file, file_format), start=1):
+                    serializer = EvaluationImportSerializer(data=row)
+                    if serializer.is_valid():
+                        batch.append((number, serializer.validated_data))
+                    else:
+                        self._reject(number, serializer.errors)
+                    if len(batch) >= options["batch_size"]:
+                        self._write(batch)
+                        batch = []
+                self._write(batch)
+        except OSError as error:
+            raise CommandError(f"Cannot read {path}: {error}.")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inserted {self.inserted}, updated {self.updated}, rejected {self.rejected} evaluation(s)."
+            )
+        )
+
+    def _write(self, batch):
+        """Upsert a batch of validated rows and count the results."""
+        if not batch:
+            return
+        saved, updated, errors = upsert_evaluations(batch)
+        self.inserted += len(saved) - updated
+        self.updated += updated
+        for number, message in errors.items():
+            self._reject(number, message)
+
+    def _reject(self, number, errors):
+        self.rejected += 1
+        self.stderr.write(f"Row {number}: {errors}")
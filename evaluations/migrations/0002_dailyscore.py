@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_scores(apps, schema_editor):
+    """Roll up the scores of existing evaluations by performer and day."""
+    Evaluation = apps.get_model("evaluations", "Evaluation")
+    DailyScore = apps.get_model("evaluations", "DailyScore")
+
+    rows = (
+        Evaluation.objects.filter(task__task_performer__isnull=False)
+        .annotate(day=TruncDate("created_at"))
+        .values("task__task_performer_id", "day")
+        .annotate(score_sum=Sum("score"), score_count=Count("pk"))
+        .order_by()
+    )
+    DailyScore.objects.bulk_create(
+        (
+            DailyScore(
+                user_id=row["task__task_performer_id"],
+                day=row["day"],
+                score_sum=row["score_sum"],
+                score_count=row["score_count"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluations", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="День")),
+                (
+                    "score_sum",
+                    models.PositiveIntegerField(default=0, verbose_name="Сумма оценок"),
+                ),
+                (
+                    "score_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество оценок"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_scores",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Исполнитель",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Оценки за день",
+                "verbose_name_plural": "Оценки по дням",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "day"), name="unique_daily_score_per_user"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_daily_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:04
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The index of a large table is built without locking writes.
+    atomic = False
+
+    dependencies = [
+        ("evaluations", "0002_dailyscore"),
+        ("tasks", "0005_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="evaluation",
+            index=models.Index(
+                fields=["created_at", "id"], name="evaluation_created_at"
+            ),
+        ),
+    ]
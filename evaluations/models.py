@@ -39,6 +39,36 @@ class Evaluation(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["task", "author"], name="unique_evaluation_per_task")
         ]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="evaluation_created_at"),
+        ]
 
     def __str__(self):
         return f"Оценка от {self.author} - {self.score} за задачу '{self.task}'"
+
+
+class DailyScore(models.Model):
+    """
+    Daily rollup of the scores of the tasks performed by a user.
+    It is maintained by the evaluation and task signals, so averages over any range of days
+    are a sum of a few rows.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        verbose_name="Исполнитель",
+        related_name="daily_scores",
+    )
+    day = models.DateField(verbose_name="День")
+    score_sum = models.PositiveIntegerField(default=0, verbose_name="Сумма оценок")
+    score_count = models.PositiveIntegerField(default=0, verbose_name="Количество оценок")
+
+    class Meta:
+        verbose_name = "Оценки за день"
+        verbose_name_plural = "Оценки по дням"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="unique_daily_score_per_user")
+        ]
+
+    def __str__(self):
+        return f"Оценки {self.user} за {self.day}: {self.score_sum}/{self.score_count}"
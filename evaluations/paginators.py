@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from config.pagination import KeysetPagination
+
+
+class EvaluationCursorPagination(KeysetPagination):
+    """Evaluations from the newest to the oldest."""
+
+    ordering_field = "created_at"
+    descending = True
+
+    def parse_value(self, value):
+        return datetime.fromisoformat(value)
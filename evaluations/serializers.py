@@ -1,3 +1,4 @@
+from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, StringRelatedField, PrimaryKeyRelatedField
 from evaluations.models import Evaluation
 from tasks.models import Task
@@ -20,3 +21,73 @@ class EvaluationSerializer(ModelSerializer):
             "task_performer",
         )
         read_only_fields = ("task_performer", "author")
+
+
+class EvaluationBulkItemSerializer(serializers.Serializer):
+    """
+    Serializer for a single evaluation of the bulk upsert request.
+    Tasks are plain ids, their existence is checked for the whole batch at once.
+    """
+
+    task = serializers.IntegerField()
+    score = serializers.ChoiceField(choices=Evaluation.SCORE_CHOICES)
+    comment = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+
+class EvaluationImportSerializer(EvaluationBulkItemSerializer):
+    """Serializer for a single imported evaluation, which also carries the id of its author."""
+
+    author = serializers.IntegerField()
+
+
+class EvaluationBulkSerializer(serializers.Serializer):
+    """Serializer for validating the body of the bulk upsert request."""
+
+    evaluations = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=1000)
+
+
+class EvaluationListQuerySerializer(serializers.Serializer):
+    """Serializer for validating filters of the evaluation list, dates are local days of creation."""
+
+    task = serializers.IntegerField(required=False)
+    author = serializers.IntegerField(required=False)
+    task_performer = serializers.IntegerField(required=False)
+    created_from = serializers.DateField(required=False)
+    created_to = serializers.DateField(required=False)
+
+    def validate(self, data):
+        """Validate that the date range is not empty."""
+        if "created_from" in data and "created_to" in data and data["created_from"] > data["created_to"]:
+            raise serializers.ValidationError("Date range start cannot be later than its end.")
+        return data
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    """Serializer for validating the period, team and size of the leaderboard."""
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    team = serializers.IntegerField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate(self, data):
+        """Validate that the period is not empty."""
+        if "start" in data and "end" in data and data["start"] > data["end"]:
+            raise serializers.ValidationError("Period start cannot be later than its end.")
+        return data
+
+
+class ScoreAnalyticsQuerySerializer(serializers.Serializer):
+    """Serializer for validating the scope, period and trend buckets of the score analytics."""
+
+    user = serializers.IntegerField(required=False)
+    team = serializers.IntegerField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    bucket = serializers.ChoiceField(choices=("week", "month"), default="month")
+
+    def validate(self, data):
+        """Validate that the period is not empty."""
+        if "start" in data and "end" in data and data["start"] > data["end"]:
+            raise serializers.ValidationError("Period start cannot be later than its end.")
+        return data
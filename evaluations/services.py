@@ -0,0 +1,310 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import connection, transaction
+from django.db.models import Aggregate, Avg, Case, Count, DateField, F, FloatField, Q, Sum, Value, When, Window
+from django.db.models.functions import Cast, DenseRank, Rank, TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from evaluations.cache import invalidate_leaderboards
+from evaluations.models import DailyScore, Evaluation
+from tasks.models import Task
+from users.models import User
+
+
+PERCENTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+class PercentileCont(Aggregate):
+    """Continuous percentiles of the expression for each of the fractions, as an array."""
+
+    function = "percentile_cont"
+    template = "%(function)s(ARRAY[%(fractions)s]) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, fractions, **extra):
+        super().__init__(
+            expression,
+            fractions=", ".join(str(float(fraction)) for fraction in fractions),
+            output_field=ArrayField(FloatField()),
+            **extra,
+        )
+
+
+def filter_created_days(evaluations, start=None, end=None):
+    """
+    Filter evaluations created on the local days from start to end, both included.
+    Days are turned into bounds of created_at, so the range is served by its index.
+    """
+    if start:
+        evaluations = evaluations.filter(created_at__gte=timezone.make_aware(datetime.combine(start, time.min)))
+    if end:
+        next_day = datetime.combine(end + timedelta(days=1), time.min)
+        evaluations = evaluations.filter(created_at__lt=timezone.make_aware(next_day))
+    return evaluations
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def score_analytics(user_id=None, team_id=None, start=None, end=None, bucket="month"):
+    """
+    Return the score histogram, percentiles and the trend of the average score by week or month
+    for the evaluations of a performer, of the members of a team or of everyone.
+    Everything is computed by PostgreSQL with two queries: the distribution and the trend.
+    """
+    evaluations = filter_created_days(Evaluation.objects.all(), start, end)
+    if user_id is not None:
+        evaluations = evaluations.filter(task__task_performer_id=user_id)
+    if team_id is not None:
+        evaluations = evaluations.filter(task__task_performer__teams=team_id)
+
+    scores = [score for score, _ in Evaluation.SCORE_CHOICES]
+    summary = evaluations.aggregate(
+        count=Count("pk"),
+        average=Avg("score"),
+        percentiles=PercentileCont("score", PERCENTILES),
+        **{f"score_{score}": Count("pk", filter=Q(score=score)) for score in scores},
+    )
+    truncate = TruncWeek if bucket == "week" else TruncMonth
+    trend = (
+        evaluations.annotate(period=truncate("created_at", output_field=DateField()))
+        .values("period")
+        .annotate(count=Count("pk"), average=Avg("score"))
+        .order_by("period")
+    )
+
+    return {
+        "count": summary["count"],
+        "average": _round(summary["average"]),
+        "histogram": {score: summary[f"score_{score}"] for score in scores},
+        "percentiles": {
+            f"p{round(fraction * 100)}": _round(value)
+            for fraction, value in zip(PERCENTILES, summary["percentiles"] or [None] * len(PERCENTILES))
+        },
+        "trend": [
+            {"period": row["period"], "count": row["count"], "average": _round(row["average"])} for row in trend
+        ],
+    }
+
+
+def average_scores(users, start=None, end=None):
+    """
+    Return {user_id: average score rounded to 2 places} of the users over the days from start to end,
+    both included, with a single query grouped by user. Users without scores in the period are missing.
+    """
+    scores = DailyScore.objects.filter(user__in=users)
+    if start:
+        scores = scores.filter(day__gte=start)
+    if end:
+        scores = scores.filter(day__lte=end)
+
+    totals = scores.values("user_id").annotate(score_sum=Sum("score_sum"), score_count=Sum("score_count")).order_by()
+    return {
+        row["user_id"]: round(row["score_sum"] / row["score_count"], 2) for row in totals if row["score_count"]
+    }
+
+
+def leaderboard(start=None, end=None, team_id=None, limit=10):
+    """
+    Return the top performers by average score over the days from start to end, optionally of a team.
+    Ranks are computed by window functions over all performers of the period: rank orders by the average,
+    then by the number of evaluations, count_rank orders by the number of evaluations alone.
+    """
+    scores = DailyScore.objects.all()
+    if start:
+        scores = scores.filter(day__gte=start)
+    if end:
+        scores = scores.filter(day__lte=end)
+    if team_id is not None:
+        scores = scores.filter(user__teams=team_id)
+
+    average = Cast(Sum("score_sum"), FloatField()) / Sum("score_count")
+    rows = (
+        scores.values("user_id", "user__email")
+        .annotate(
+            average_score=average,
+            evaluation_count=Sum("score_count"),
+            rank=Window(Rank(), order_by=[average.desc(), Sum("score_count").desc()]),
+            count_rank=Window(DenseRank(), order_by=Sum("score_count").desc()),
+        )
+        .filter(evaluation_count__gt=0)
+        .order_by("rank", "user_id")[:limit]
+    )
+    return [
+        {
+            "rank": row["rank"],
+            "count_rank": row["count_rank"],
+            "user_id": row["user_id"],
+            "task_performer": row["user__email"],
+            "average_score": round(row["average_score"], 2),
+            "evaluation_count": row["evaluation_count"],
+        }
+        for row in rows
+    ]
+
+
+def task_daily_scores(task_ids):
+    """Return {task_id: [(day, score_sum, score_count)]} of the evaluations of the tasks, with a single query."""
+    rows = (
+        Evaluation.objects.filter(task_id__in=task_ids)
+        .annotate(day=TruncDate("created_at"))
+        .values("task_id", "day")
+        .annotate(score_sum=Sum("score"), score_count=Count("pk"))
+        .order_by()
+    )
+    scores = defaultdict(list)
+    for row in rows:
+        scores[row["task_id"]].append((row["day"], row["score_sum"], row["score_count"]))
+    return scores
+
+
+def score_deltas():
+    """Changes of the rollup, {(user_id, day): [score_sum, score_count]}."""
+    return defaultdict(lambda: [0, 0])
+
+
+def add_evaluation_score(deltas, user_id, created_at, score, sign=1):
+    """Add the score of an evaluation of a task performed by the user to the deltas."""
+    delta = deltas[(user_id, timezone.localdate(created_at))]
+    delta[0] += sign * score
+    delta[1] += sign
+
+
+def apply_score_deltas(deltas):
+    """
+    Add the deltas to the rollup rows with two queries, however many rows change. Tasks without a performer
+    are skipped. Cached leaderboards are dropped once the surrounding transaction is committed.
+    """
+    changes = {key: delta for key, delta in deltas.items() if key[0] is not None and any(delta)}
+    if not changes:
+        return
+
+    # Missing rows are created empty first, so a single UPDATE adds all the deltas.
+    DailyScore.objects.bulk_create(
+        [DailyScore(user_id=user_id, day=day) for user_id, day in changes], ignore_conflicts=True
+    )
+    condition, sums, counts = Q(), [], []
+    for (user_id, day), (score_sum, score_count) in changes.items():
+        match = Q(user_id=user_id, day=day)
+        condition |= match
+        sums.append(When(match, then=Value(score_sum)))
+        counts.append(When(match, then=Value(score_count)))
+    DailyScore.objects.filter(condition).update(
+        score_sum=F("score_sum") + Case(*sums, default=Value(0)),
+        score_count=F("score_count") + Case(*counts, default=Value(0)),
+    )
+    transaction.on_commit(invalidate_leaderboards)
+
+
+def move_task_scores(reassignments):
+    """
+    Move the scores of reassigned tasks from their previous performers to the current ones.
+    Reassignments are {task_id: (previous performer id, current performer id)}.
+    """
+    deltas = score_deltas()
+    for task_id, days in task_daily_scores(reassignments).items():
+        previous_id, current_id = reassignments[task_id]
+        for day, score_sum, score_count in days:
+            for user_id, sign in ((previous_id, -1), (current_id, 1)):
+                delta = deltas[(user_id, day)]
+                delta[0] += sign * score_sum
+                delta[1] += sign * score_count
+    apply_score_deltas(deltas)
+
+
+def _insert_missing_evaluations(evaluations):
+    """
+    Insert the evaluations with a single INSERT ... ON CONFLICT (task, author) DO NOTHING RETURNING,
+    return {(task_id, author_id): (id, created_at)} of the rows this statement inserted.
+    Evaluations that exist, including ones committed concurrently, are left untouched.
+    """
+    meta = Evaluation._meta
+    columns = [meta.get_field(name) for name in ("task", "author", "score", "comment", "created_at")]
+    created_at = timezone.now()
+    params = []
+    for evaluation in evaluations:
+        params += [evaluation.task_id, evaluation.author_id, evaluation.score, evaluation.comment, created_at]
+    quote = connection.ops.quote_name
+    row = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    sql = (
+        f"INSERT INTO {quote(meta.db_table)} ({', '.join(quote(field.column) for field in columns)}) "
+        f"VALUES {', '.join([row] * len(evaluations))} "
+        f"ON CONFLICT ({quote(columns[0].column)}, {quote(columns[1].column)}) DO NOTHING "
+        f"RETURNING {quote(meta.pk.column)}, {quote(columns[0].column)}, {quote(columns[1].column)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {(task_id, author_id): (pk, created_at) for pk, task_id, author_id in cursor.fetchall()}
+
+
+def upsert_evaluations(candidates):
+    """
+    Insert or update evaluations in bulk: new ones with a single INSERT ... ON CONFLICT DO NOTHING,
+    the rest are locked with their previous scores and updated with a single UPDATE.
+    Candidates are (index, validated data) pairs with task and author ids, tasks and authors of the whole batch
+    are checked at once. An existing evaluation gets the new score and comment and keeps its creation date.
+    Returns saved evaluations keyed by the candidate index, the number of updated ones and error messages.
+    """
+    saved, errors = {}, {}
+    with transaction.atomic():
+        performers = dict(
+            Task.objects.filter(pk__in={data["task"] for _, data in candidates}).values_list("pk", "task_performer_id")
+        )
+        author_ids = set(
+            User.objects.filter(pk__in={data["author"] for _, data in candidates}).values_list("pk", flat=True)
+        )
+
+        accepted = {}
+        for index, data in candidates:
+            key = (data["task"], data["author"])
+            if data["task"] not in performers:
+                errors[index] = f"Unknown task: {data['task']}."
+            elif data["author"] not in author_ids:
+                errors[index] = f"Unknown author: {data['author']}."
+            elif key in accepted:
+                errors[index] = f"Task {data['task']} is evaluated twice by author {data['author']}."
+            else:
+                accepted[key] = (index, data)
+        if not accepted:
+            return saved, 0, errors
+
+        evaluations = {
+            (task_id, author_id): Evaluation(
+                task_id=task_id, author_id=author_id, score=data["score"], comment=data.get("comment")
+            )
+            for (task_id, author_id), (_, data) in accepted.items()
+        }
+        inserted = _insert_missing_evaluations(evaluations.values())
+
+        # Whoever inserted the others has committed by now: they are locked with the scores that leave the rollup.
+        rows = (
+            Evaluation.objects.select_for_update()
+            .filter(task_id__in={key[0] for key in accepted}, author_id__in={key[1] for key in accepted})
+            .values_list("pk", "task_id", "author_id", "score", "created_at")
+        )
+        existing = {
+            (task_id, author_id): (pk, score, created_at)
+            for pk, task_id, author_id, score, created_at in rows
+            if (task_id, author_id) in accepted and (task_id, author_id) not in inserted
+        }
+
+        deltas = score_deltas()
+        for key, (index, _) in accepted.items():
+            evaluation, performer_id = evaluations[key], performers[key[0]]
+            if key in inserted:
+                evaluation.pk, evaluation.created_at = inserted[key]
+            elif key in existing:
+                evaluation.pk, previous_score, evaluation.created_at = existing[key]
+                add_evaluation_score(deltas, performer_id, evaluation.created_at, previous_score, sign=-1)
+            else:
+                errors[index] = f"Evaluation of task {key[0]} by author {key[1]} was deleted concurrently."
+                continue
+            add_evaluation_score(deltas, performer_id, evaluation.created_at, evaluation.score)
+            saved[index] = evaluation
+
+        Evaluation.objects.bulk_update([evaluations[key] for key in existing], ["score", "comment"])
+        apply_score_deltas(deltas)
+
+    return saved, len(existing), errors
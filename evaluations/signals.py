@@ -0,0 +1,67 @@
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from evaluations.models import Evaluation
+from evaluations.services import add_evaluation_score, apply_score_deltas, move_task_scores, score_deltas
+from tasks.models import Task
+from tasks.signals import tasks_bulk_saved
+
+
+@receiver(pre_save, sender=Evaluation)
+def remember_evaluation_score(sender, instance, **kwargs):
+    """Keep the stored score of an evaluation to move it out of the rollup if it changes."""
+    if instance.pk:
+        instance._previous_score = (
+            Evaluation.objects.filter(pk=instance.pk)
+            .values_list("task__task_performer_id", "created_at", "score")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Evaluation)
+def roll_up_evaluation_score(sender, instance, **kwargs):
+    """Add the score to the rollup of the task performer, replacing the previous score."""
+    deltas = score_deltas()
+    previous = getattr(instance, "_previous_score", None)
+    if previous:
+        add_evaluation_score(deltas, *previous, sign=-1)
+    add_evaluation_score(deltas, instance.task.task_performer_id, instance.created_at, instance.score)
+    apply_score_deltas(deltas)
+
+
+@receiver(pre_delete, sender=Evaluation)
+def remove_evaluation_score(sender, instance, **kwargs):
+    """Remove the score from the rollup while the evaluated task still exists."""
+    performer_id = Task.objects.filter(pk=instance.task_id).values_list("task_performer_id", flat=True).first()
+    deltas = score_deltas()
+    add_evaluation_score(deltas, performer_id, instance.created_at, instance.score, sign=-1)
+    apply_score_deltas(deltas)
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_performer(sender, instance, **kwargs):
+    """Keep the stored performer of a task to move its scores if the task is reassigned."""
+    if instance.pk:
+        instance._scores_previous_performer = (
+            Task.objects.filter(pk=instance.pk).values_list("task_performer_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Task)
+def move_reassigned_task_scores(sender, instance, created, **kwargs):
+    """Move the scores of a reassigned task to its new performer."""
+    previous_id = getattr(instance, "_scores_previous_performer", None)
+    if not created and previous_id != instance.task_performer_id:
+        move_task_scores({instance.pk: (previous_id, instance.task_performer_id)})
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def move_bulk_reassigned_task_scores(sender, tasks, previous, **kwargs):
+    """Move the scores of tasks reassigned in bulk to their new performers."""
+    move_task_scores(
+        {
+            task.pk: (previous[task.pk][0], task.task_performer_id)
+            for task in tasks
+            if task.pk in previous and previous[task.pk][0] != task.task_performer_id
+        }
+    )
@@ -1,18 +1,50 @@
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.exceptions import ValidationError
 from django.db import IntegrityError
+from evaluations.cache import get_evaluation_cache, leaderboard_cache_key
 from evaluations.models import Evaluation
-from evaluations.serializers import EvaluationSerializer
+from evaluations.paginators import EvaluationCursorPagination
+from evaluations.serializers import (EvaluationBulkItemSerializer, EvaluationBulkSerializer,
+                                     EvaluationListQuerySerializer, EvaluationSerializer, LeaderboardQuerySerializer,
+                                     ScoreAnalyticsQuerySerializer)
+from evaluations.services import filter_created_days, leaderboard, score_analytics, upsert_evaluations
 from users.permissions import IsManagerPermission, IsAuthorOrAdminForUpdateDelete
 
 
 class EvaluationViewSet(ModelViewSet):
-    """A viewset for viewing, creating, updating, and deleting Evaluation instances."""
+    """
+    A viewset for viewing, creating, updating, and deleting Evaluation instances.
+    The list is filtered by task, author, performer and date and paginated with a cursor.
+    """
     serializer_class = EvaluationSerializer
+    pagination_class = EvaluationCursorPagination
 
     def get_queryset(self):
-        return Evaluation.objects.select_related("task", "author")
+        """Load the performers with their evaluations, apply list filters from the query parameters."""
+        queryset = Evaluation.objects.select_related("task__task_performer").defer(
+            "task__description", "task__search_vector"
+        )
+        if self.action != "list":
+            return queryset
+
+        query = EvaluationListQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        filters = {
+            "task": "task_id",
+            "author": "author_id",
+            "task_performer": "task__task_performer_id",
+        }
+        queryset = queryset.filter(
+            **{lookup: query.validated_data[param] for param, lookup in filters.items() if param in query.validated_data}
+        )
+        return filter_created_days(
+            queryset, query.validated_data.get("created_from"), query.validated_data.get("created_to")
+        )
 
     def get_permissions(self):
         if self.request.method in SAFE_METHODS:
@@ -27,3 +59,67 @@ class EvaluationViewSet(ModelViewSet):
             serializer.save(author=self.request.user)
         except IntegrityError:
             raise ValidationError("Оценка для этой задачи от данного пользователя уже существует.")
+
+    @action(detail=False, methods=["post"], url_path="bulk-upsert")
+    def bulk_upsert(self, request):
+        """
+        Create or update many evaluations of the current user at once.
+        An evaluation of a task the user has already evaluated replaces its score and comment.
+        """
+        body = EvaluationBulkSerializer(data=request.data)
+        body.is_valid(raise_exception=True)
+        items = body.validated_data["evaluations"]
+
+        candidates, errors = [], {}
+        for index, item in enumerate(items):
+            serializer = EvaluationBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                candidates.append((index, {**serializer.validated_data, "author": request.user.pk}))
+            else:
+                errors[index] = serializer.errors
+        saved, updated, failures = upsert_evaluations(candidates)
+        for index, message in failures.items():
+            errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+
+        results = [
+            {"index": index, "id": saved[index].pk} if index in saved else {"index": index, "errors": errors[index]}
+            for index in range(len(items))
+        ]
+        return Response(
+            {"inserted": len(saved) - updated, "updated": updated, "rejected": len(errors), "results": results},
+            status=status.HTTP_200_OK if saved else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=False, methods=["get"], url_path="leaderboard")
+    def leaderboard(self, request):
+        """Top performers by average score for a period, optionally of a team, cached until scores change."""
+        query = LeaderboardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start, end = query.validated_data.get("start"), query.validated_data.get("end")
+        team_id, limit = query.validated_data.get("team"), query.validated_data["limit"]
+
+        cache_key = leaderboard_cache_key(team_id, start, end, limit)
+        results = get_evaluation_cache().get(cache_key)
+        if results is None:
+            results = leaderboard(start, end, team_id, limit)
+            get_evaluation_cache().set(cache_key, results)
+
+        return Response({"period": {"start": start, "end": end}, "team": team_id, "results": results})
+
+    @action(detail=False, methods=["get"], url_path="analytics")
+    def analytics(self, request):
+        """Score histogram, percentiles and trend of a performer, of a team or of the whole organization."""
+        query = ScoreAnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = query.validated_data
+        start, end = data.get("start"), data.get("end")
+
+        return Response(
+            {
+                "user": data.get("user"),
+                "team": data.get("team"),
+                "period": {"start": start, "end": end},
+                "bucket": data["bucket"],
+                **score_analytics(data.get("user"), data.get("team"), start, end, data["bucket"]),
+            }
+        )
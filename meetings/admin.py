@@ -1,6 +1,21 @@
 from django.contrib import admin
 
-from meetings.models import Meeting
+from meetings.models import Meeting, MeetingException, MeetingParticipant
+
+
+class MeetingParticipantInline(admin.TabularInline):
+    """Inline for changing meeting participants, the meeting date and time are copied by signals."""
+
+    model = MeetingParticipant
+    fields = ("user",)
+    extra = 0
+
+
+class MeetingExceptionInline(admin.TabularInline):
+    """Inline for changing single occurrences of a recurring meeting."""
+
+    model = MeetingException
+    extra = 0
 
 
 @admin.register(Meeting)
@@ -12,9 +27,29 @@ class MeetingAdmin(admin.ModelAdmin):
         "title",
         "date",
         "organizer",
+        "recurrence",
     )
 
     list_filter = (
         "date",
         "organizer",
-    )
\ No newline at end of file
+        "recurrence",
+    )
+
+    inlines = (MeetingParticipantInline, MeetingExceptionInline)
+
+    def save_formset(self, request, form, formset, change):
+        """Save participants through Meeting.participants, so their bookings are kept in sync by signals."""
+        if formset.model is not MeetingParticipant:
+            return super().save_formset(request, form, formset, change)
+
+        # Collects new, changed and deleted rows for the change message without saving them.
+        formset.save(commit=False)
+        meeting = form.instance
+        for participant_form in formset.forms:
+            deleted = participant_form in formset.deleted_forms
+            previous_user = participant_form.initial.get("user")
+            if previous_user and (deleted or participant_form.has_changed()):
+                meeting.participants.remove(previous_user)
+            if not deleted and participant_form.has_changed():
+                meeting.participants.add(participant_form.cleaned_data["user"])
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:29
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import django.db.models.deletion
+import meetings.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeetingBooking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    django.contrib.postgres.fields.ranges.DateTimeRangeField(
+                        verbose_name="Время встречи"
+                    ),
+                ),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bookings",
+                        to="meetings.meeting",
+                        verbose_name="Встреча",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="meeting_bookings",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Участник встречи",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Бронирование времени",
+                "verbose_name_plural": "Бронирования времени",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("meeting", "user"), name="unique_meeting_booking"
+                    ),
+                    django.contrib.postgres.constraints.ExclusionConstraint(
+                        expressions=[
+                            (
+                                meetings.models.Int8Range(
+                                    "user",
+                                    "user",
+                                    django.contrib.postgres.fields.ranges.RangeBoundary(
+                                        inclusive_lower=True, inclusive_upper=True
+                                    ),
+                                ),
+                                "&&",
+                            ),
+                            ("period", "&&"),
+                        ],
+                        name="exclude_overlapping_meeting_bookings",
+                    ),
+                ],
+            },
+        ),
+    ]
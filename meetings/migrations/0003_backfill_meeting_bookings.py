@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from django.db import migrations
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.utils import timezone
+
+BATCH_SIZE = 2000
+
+
+def backfill_bookings(apps, schema_editor):
+    """
+    Create bookings for existing meeting participants.
+    Legacy double bookings violate the exclusion constraint and are skipped.
+    """
+    Meeting = apps.get_model("meetings", "Meeting")
+    MeetingBooking = apps.get_model("meetings", "MeetingBooking")
+
+    participants = Meeting.participants.through.objects.values_list(
+        "meeting_id",
+        "user_id",
+        "meeting__date",
+        "meeting__start_time",
+        "meeting__end_time",
+    ).order_by("meeting__date", "meeting__start_time", "pk")
+
+    batch = []
+    for meeting_id, user_id, date, start_time, end_time in participants.iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        start = timezone.make_aware(datetime.combine(date, start_time))
+        end = timezone.make_aware(datetime.combine(date, end_time))
+        batch.append(
+            MeetingBooking(
+                meeting_id=meeting_id,
+                user_id=user_id,
+                period=DateTimeTZRange(start, max(start, end)),
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            MeetingBooking.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    MeetingBooking.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0002_meetingbooking"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_bookings, migrations.RunPython.noop),
+    ]
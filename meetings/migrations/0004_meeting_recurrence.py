@@ -0,0 +1,102 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:35
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0003_backfill_meeting_bookings"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meeting",
+            name="recurrence",
+            field=models.CharField(
+                choices=[("none", "None"), ("daily", "Daily"), ("weekly", "Weekly")],
+                default="none",
+                max_length=20,
+                verbose_name="Повторение встречи",
+            ),
+        ),
+        migrations.AddField(
+            model_name="meeting",
+            name="recurrence_interval",
+            field=models.PositiveSmallIntegerField(
+                default=1,
+                validators=[django.core.validators.MinValueValidator(1)],
+                verbose_name="Интервал повторения",
+            ),
+        ),
+        migrations.AddField(
+            model_name="meeting",
+            name="recurrence_until",
+            field=models.DateField(
+                blank=True, null=True, verbose_name="Дата последнего повторения"
+            ),
+        ),
+        migrations.CreateModel(
+            name="MeetingException",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "original_date",
+                    models.DateField(verbose_name="Исходная дата повторения"),
+                ),
+                (
+                    "is_cancelled",
+                    models.BooleanField(
+                        default=False, verbose_name="Повторение отменено"
+                    ),
+                ),
+                (
+                    "date",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="Новая дата повторения"
+                    ),
+                ),
+                (
+                    "start_time",
+                    models.TimeField(
+                        blank=True, null=True, verbose_name="Новое время начала"
+                    ),
+                ),
+                (
+                    "end_time",
+                    models.TimeField(
+                        blank=True, null=True, verbose_name="Новое время окончания"
+                    ),
+                ),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exceptions",
+                        to="meetings.meeting",
+                        verbose_name="Встреча",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Изменение повторения встречи",
+                "verbose_name_plural": "Изменения повторений встреч",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("meeting", "original_date"),
+                        name="unique_meeting_exception",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_participant_schedule(apps, schema_editor):
+    """Copy the date and time of meetings to their participants."""
+    Meeting = apps.get_model("meetings", "Meeting")
+    MeetingParticipant = apps.get_model("meetings", "MeetingParticipant")
+
+    meeting = Meeting.objects.filter(pk=OuterRef("meeting_id"))
+    MeetingParticipant.objects.update(
+        date=Subquery(meeting.values("date")[:1]),
+        start_time=Subquery(meeting.values("start_time")[:1]),
+        end_time=Subquery(meeting.values("end_time")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0004_meeting_recurrence"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # The table of the automatic through model is kept, only the state switches to the explicit model.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="MeetingParticipant",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "meeting",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="participations",
+                                to="meetings.meeting",
+                                verbose_name="Встреча",
+                            ),
+                        ),
+                        (
+                            "user",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="meeting_participations",
+                                to=settings.AUTH_USER_MODEL,
+                                verbose_name="Участник встречи",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "verbose_name": "Участник встречи",
+                        "verbose_name_plural": "Участники встреч",
+                        "db_table": "meetings_meeting_participants",
+                        "unique_together": {("meeting", "user")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="meeting",
+                    name="participants",
+                    field=models.ManyToManyField(
+                        related_name="meetings",
+                        through="meetings.MeetingParticipant",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Участники встречи",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="meetingparticipant",
+            name="date",
+            field=models.DateField(blank=True, null=True, verbose_name="Дата встречи"),
+        ),
+        migrations.AddField(
+            model_name="meetingparticipant",
+            name="start_time",
+            field=models.TimeField(blank=True, null=True, verbose_name="Время начала встречи"),
+        ),
+        migrations.AddField(
+            model_name="meetingparticipant",
+            name="end_time",
+            field=models.TimeField(blank=True, null=True, verbose_name="Время окончания встречи"),
+        ),
+        migrations.RunPython(backfill_participant_schedule, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="meetingparticipant",
+            index=models.Index(
+                fields=["user", "date", "start_time"],
+                include=("meeting", "end_time"),
+                name="meeting_participant_user_date",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0005_meetingparticipant"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meeting",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Дата изменения"),
+        ),
+    ]
@@ -1,15 +1,53 @@
+from datetime import datetime
+
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import BigIntegerRangeField, DateTimeRangeField, RangeBoundary, RangeOperators
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.utils import timezone
 from config import settings
 from tasks.models import NULLABLE
 
+BOOKING_OVERLAP_CONSTRAINT = "exclude_overlapping_meeting_bookings"
+
+
+def meeting_period(date, start_time, end_time):
+    """Return the meeting time as a half-open datetime range in the current time zone."""
+    start = timezone.make_aware(datetime.combine(date, start_time))
+    end = timezone.make_aware(datetime.combine(date, end_time))
+    return DateTimeTZRange(start, max(start, end))
+
+
+class MeetingRecurrence(models.TextChoices):
+    NONE = "none", "None"
+    DAILY = "daily", "Daily"
+    WEEKLY = "weekly", "Weekly"
+
 
 class Meeting(models.Model):
-    """Model representing a meeting."""
+    """
+    Model representing a meeting.
+    A recurring meeting is stored once, date is the date of its first occurrence.
+    """
     title = models.CharField(max_length=200, verbose_name="Название встречи")
     description = models.TextField(verbose_name="Описание встречи", **NULLABLE)
     date = models.DateField(verbose_name="Дата встречи")
     start_time = models.TimeField(verbose_name="Время начала встречи")
     end_time = models.TimeField(verbose_name="Время окончания встречи")
+    recurrence = models.CharField(
+        max_length=20,
+        choices=MeetingRecurrence.choices,
+        default=MeetingRecurrence.NONE,
+        verbose_name="Повторение встречи",
+    )
+    recurrence_interval = models.PositiveSmallIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        verbose_name="Интервал повторения",
+    )
+    recurrence_until = models.DateField(verbose_name="Дата последнего повторения", **NULLABLE)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата изменения")
     organizer = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -18,6 +56,7 @@ class Meeting(models.Model):
     )
     participants = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
+        through="MeetingParticipant",
         verbose_name="Участники встречи",
         related_name="meetings"
     )
@@ -29,3 +68,132 @@ class Meeting(models.Model):
 
     def __str__(self):
         return f"Встреча - {self.title} Организатор - {self.organizer}"
+
+    @property
+    def is_recurring(self):
+        """Check whether the meeting repeats."""
+        return self.recurrence != MeetingRecurrence.NONE
+
+    def get_period(self):
+        """Return the meeting time as a datetime range."""
+        return meeting_period(
+            self._meta.get_field("date").to_python(self.date),
+            self._meta.get_field("start_time").to_python(self.start_time),
+            self._meta.get_field("end_time").to_python(self.end_time),
+        )
+
+
+class MeetingParticipant(models.Model):
+    """
+    Participant of a meeting.
+    The meeting date and time are copied from the meeting and kept in sync by signals,
+    so meetings of a user on a date are found by a range scan of a single index.
+    """
+    meeting = models.ForeignKey(
+        Meeting,
+        on_delete=models.CASCADE,
+        related_name="participations",
+        verbose_name="Встреча",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="meeting_participations",
+        verbose_name="Участник встречи",
+    )
+    date = models.DateField(verbose_name="Дата встречи", **NULLABLE)
+    start_time = models.TimeField(verbose_name="Время начала встречи", **NULLABLE)
+    end_time = models.TimeField(verbose_name="Время окончания встречи", **NULLABLE)
+
+    class Meta:
+        db_table = "meetings_meeting_participants"
+        verbose_name = "Участник встречи"
+        verbose_name_plural = "Участники встреч"
+        unique_together = [("meeting", "user")]
+        indexes = [
+            models.Index(
+                fields=["user", "date", "start_time"],
+                include=["meeting", "end_time"],
+                name="meeting_participant_user_date",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.meeting}"
+
+
+class MeetingException(models.Model):
+    """
+    Change of a single occurrence of a recurring meeting.
+    The occurrence is either cancelled or moved, empty fields keep the values of the series.
+    """
+    meeting = models.ForeignKey(
+        Meeting,
+        on_delete=models.CASCADE,
+        related_name="exceptions",
+        verbose_name="Встреча",
+    )
+    original_date = models.DateField(verbose_name="Исходная дата повторения")
+    is_cancelled = models.BooleanField(default=False, verbose_name="Повторение отменено")
+    date = models.DateField(verbose_name="Новая дата повторения", **NULLABLE)
+    start_time = models.TimeField(verbose_name="Новое время начала", **NULLABLE)
+    end_time = models.TimeField(verbose_name="Новое время окончания", **NULLABLE)
+
+    class Meta:
+        verbose_name = "Изменение повторения встречи"
+        verbose_name_plural = "Изменения повторений встреч"
+        constraints = [
+            models.UniqueConstraint(fields=["meeting", "original_date"], name="unique_meeting_exception"),
+        ]
+
+    def __str__(self):
+        return f"Изменение {self.meeting} от {self.original_date}"
+
+
+class Int8Range(models.Func):
+    """
+    Single point range of a user id.
+    Lets the exclusion constraint compare users with GiST range operators without the btree_gist extension.
+    """
+    function = "INT8RANGE"
+    output_field = BigIntegerRangeField()
+
+
+class MeetingBooking(models.Model):
+    """
+    Time booked by a meeting participant.
+    Rows are kept in sync with Meeting.participants by signals,
+    the exclusion constraint guarantees that bookings of a user never overlap.
+    """
+    meeting = models.ForeignKey(
+        Meeting,
+        on_delete=models.CASCADE,
+        related_name="bookings",
+        verbose_name="Встреча",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="meeting_bookings",
+        verbose_name="Участник встречи",
+    )
+    period = DateTimeRangeField(verbose_name="Время встречи")
+
+    class Meta:
+        verbose_name = "Бронирование времени"
+        verbose_name_plural = "Бронирования времени"
+        constraints = [
+            models.UniqueConstraint(fields=["meeting", "user"], name="unique_meeting_booking"),
+            ExclusionConstraint(
+                name=BOOKING_OVERLAP_CONSTRAINT,
+                index_type="GIST",
+                expressions=[
+                    (Int8Range("user", "user", RangeBoundary(inclusive_lower=True, inclusive_upper=True)),
+                     RangeOperators.OVERLAPS),
+                    ("period", RangeOperators.OVERLAPS),
+                ],
+            ),
+        ]
+
+    def __str__(self):
+        return f"Бронирование {self.user} - {self.meeting}"
@@ -0,0 +1,90 @@
+import heapq
+from datetime import date, time
+from itertools import dropwhile, islice
+
+from django.db.models import Exists, OuterRef, Q
+from rest_framework.exceptions import NotFound
+
+from config.pagination import CursorPagination
+from meetings.models import Meeting, MeetingException, MeetingRecurrence
+from meetings.recurrence import iter_occurrences, occurrence_key
+
+
+class OccurrenceCursorPagination(CursorPagination):
+    """
+    Keyset pagination over meeting occurrences ordered by (date, start_time, meeting id).
+    One-off meetings are read from the database one page at a time, recurring meetings are
+    expanded lazily and merged in, so only a single page of occurrences is ever built.
+    """
+
+    def decode_cursor(self, request):
+        """Return the (date, start_time, meeting id) position encoded in the cursor."""
+        values = self.read_cursor(request, 3)
+        if values is None:
+            return None
+        try:
+            return date.fromisoformat(values[0]), time.fromisoformat(values[1]), int(values[2])
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, occurrence):
+        """Encode the position of the occurrence into the cursor."""
+        occurrence_date, start_time, meeting_id = occurrence_key(occurrence)
+        return self.write_cursor(occurrence_date.isoformat(), start_time.isoformat(), meeting_id)
+
+    def paginate_occurrences(self, user, request, start=None, end=None):
+        """
+        Return the page of occurrences of the user's meetings between optional start and end dates.
+        One-off meetings are looked up by the date and time stored on the participants index.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        if position and (start is None or position[0] > start):
+            start = position[0]
+
+        # Conditions on participants rows are combined into one filter() to join the table once.
+        one_offs = Q(participations__user=user, recurrence=MeetingRecurrence.NONE)
+        series = Meeting.objects.filter(participants=user).exclude(recurrence=MeetingRecurrence.NONE)
+        if start:
+            one_offs &= Q(participations__date__gte=start)
+            series = series.filter(
+                Q(recurrence_until__isnull=True)
+                | Q(recurrence_until__gte=start)
+                | Q(Exists(MeetingException.objects.filter(meeting=OuterRef("pk"), date__gte=start)))
+            )
+        if end:
+            one_offs &= Q(participations__date__lte=end)
+            series = series.filter(
+                Q(date__lte=end) | Q(Exists(MeetingException.objects.filter(meeting=OuterRef("pk"), date__lte=end)))
+            )
+        if position:
+            position_date, position_time, position_id = position
+            one_offs &= (
+                Q(participations__date__gt=position_date)
+                | Q(participations__date=position_date, participations__start_time__gt=position_time)
+                | Q(
+                    participations__date=position_date,
+                    participations__start_time=position_time,
+                    pk__gt=position_id,
+                )
+            )
+
+        one_offs = (
+            Meeting.objects.filter(one_offs)
+            .order_by("participations__date", "participations__start_time", "pk")
+            .prefetch_related("participants")[: page_size + 1]
+        )
+        series = series.prefetch_related("participants", "exceptions")
+
+        occurrences = heapq.merge(
+            *(iter_occurrences(meeting) for meeting in one_offs),
+            *(iter_occurrences(meeting, start, end) for meeting in series),
+            key=occurrence_key,
+        )
+        if position:
+            occurrences = dropwhile(lambda occurrence: occurrence_key(occurrence) <= position, occurrences)
+
+        page = list(islice(occurrences, page_size + 1))
+        self.next_item = page[page_size - 1] if len(page) > page_size else None
+        return page[:page_size]
@@ -0,0 +1,245 @@
+import datetime
+import heapq
+from collections import namedtuple
+from datetime import timedelta
+from math import gcd
+
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.models.functions import Coalesce
+
+from meetings.models import (Meeting, MeetingBooking, MeetingException, MeetingParticipant, MeetingRecurrence,
+                             meeting_period)
+
+Occurrence = namedtuple("Occurrence", "meeting original_date date start_time end_time")
+
+# Dates of a meeting: step is None for a one-off meeting, until is None for an endless series,
+# skip_dates are occurrences changed by exceptions.
+Schedule = namedtuple("Schedule", "date start_time end_time step until skip_dates")
+
+RECURRENCE_DAYS = {
+    MeetingRecurrence.DAILY: 1,
+    MeetingRecurrence.WEEKLY: 7,
+}
+
+
+def recurrence_step(recurrence, interval):
+    """Return the number of days between occurrences, None for a one-off meeting."""
+    if recurrence not in RECURRENCE_DAYS:
+        return None
+    return RECURRENCE_DAYS[recurrence] * interval
+
+
+def meeting_schedule(meeting, skip_dates=()):
+    """Build the schedule of a stored meeting."""
+    return Schedule(
+        meeting.date,
+        meeting.start_time,
+        meeting.end_time,
+        recurrence_step(meeting.recurrence, meeting.recurrence_interval),
+        meeting.recurrence_until,
+        frozenset(skip_dates),
+    )
+
+
+def occurs_within(start, end, date_field="date"):
+    """
+    Filter for meetings that may have occurrences between start and end dates.
+    With date_field="participations__date" the date is matched on the participants index.
+    """
+    return (
+        Q(recurrence=MeetingRecurrence.NONE, **{f"{date_field}__range": (start, end)})
+        | (
+            ~Q(recurrence=MeetingRecurrence.NONE)
+            & Q(**{f"{date_field}__lte": end})
+            & (Q(recurrence_until__isnull=True) | Q(recurrence_until__gte=start))
+        )
+        | Q(Exists(MeetingException.objects.filter(meeting=OuterRef("pk"), date__range=(start, end))))
+    )
+
+
+def schedule_contains(schedule, date):
+    """Check whether the schedule has an occurrence on the date, ignoring exceptions."""
+    if date < schedule.date or (schedule.until and date > schedule.until):
+        return False
+    if schedule.step is None:
+        return date == schedule.date
+    return (date - schedule.date).days % schedule.step == 0
+
+
+def iter_schedule_dates(schedule, start, end):
+    """Yield occurrence dates of the schedule between start and end, ignoring exceptions."""
+    if schedule.step is None:
+        if start <= schedule.date <= end:
+            yield schedule.date
+        return
+
+    last = min(end, schedule.until) if schedule.until else end
+    skipped_steps = max(0, -(-(start - schedule.date).days // schedule.step))
+    date = schedule.date + timedelta(days=skipped_steps * schedule.step)
+    while date <= last:
+        yield date
+        date += timedelta(days=schedule.step)
+
+
+def iter_common_dates(first, second):
+    """
+    Yield dates on which both schedules have an occurrence, ignoring exceptions.
+    Series are arithmetic progressions of dates, so common dates are found
+    with the Chinese remainder theorem instead of walking through the occurrences.
+    """
+    if first.step is None or second.step is None:
+        one_off, other = (first, second) if first.step is None else (second, first)
+        if schedule_contains(other, one_off.date):
+            yield one_off.date
+        return
+
+    difference = (second.date - first.date).days
+    divisor = gcd(first.step, second.step)
+    if difference % divisor:
+        return
+
+    modulus = second.step // divisor
+    steps = (difference // divisor) * pow(first.step // divisor, -1, modulus) % modulus if modulus > 1 else 0
+    period = first.step * modulus
+    date = first.date + timedelta(days=first.step * steps)
+    start = max(first.date, second.date)
+    if date < start:
+        date += timedelta(days=period * -(-(start - date).days // period))
+
+    untils = [until for until in (first.until, second.until) if until]
+    last = min(untils) if untils else None
+    while last is None or date <= last:
+        yield date
+        date += timedelta(days=period)
+
+
+def schedules_overlap(first, second):
+    """Check whether the schedules have an occurrence at the same time, taking exceptions into account."""
+    if not (first.start_time < second.end_time and second.start_time < first.end_time):
+        return False
+
+    # Every skipped date removes at most one common date, so a free common date is among the first few.
+    attempts = len(first.skip_dates) + len(second.skip_dates) + 1
+    for date in iter_common_dates(first, second):
+        if date not in first.skip_dates and date not in second.skip_dates:
+            return True
+        attempts -= 1
+        if not attempts:
+            return False
+    return False
+
+
+def has_conflicting_meetings(participants, schedule, exclude_meeting_id=None):
+    """
+    Check whether any participant has another meeting overlapping the schedule.
+    One-off meetings are checked through bookings, series only through their rules and exceptions.
+    """
+    one_offs = MeetingParticipant.objects.filter(
+        user__in=participants,
+        meeting__recurrence=MeetingRecurrence.NONE,
+        date__gte=schedule.date,
+        start_time__lt=schedule.end_time,
+        end_time__gt=schedule.start_time,
+    )
+    series = Meeting.objects.filter(
+        participants__in=participants,
+        start_time__lt=schedule.end_time,
+        end_time__gt=schedule.start_time,
+    ).exclude(recurrence=MeetingRecurrence.NONE)
+    exceptions = MeetingException.objects.filter(
+        meeting__participants__in=participants, is_cancelled=False
+    ).annotate(
+        actual_date=Coalesce("date", "original_date"),
+        actual_start_time=Coalesce("start_time", F("meeting__start_time")),
+        actual_end_time=Coalesce("end_time", F("meeting__end_time")),
+    ).filter(
+        actual_start_time__lt=schedule.end_time,
+        actual_end_time__gt=schedule.start_time,
+        actual_date__gte=schedule.date,
+    )
+    series = series.filter(Q(recurrence_until__isnull=True) | Q(recurrence_until__gte=schedule.date))
+
+    last_date = schedule.date if schedule.step is None else schedule.until
+    if last_date:
+        one_offs = one_offs.filter(date__lte=last_date)
+        series = series.filter(date__lte=last_date)
+        exceptions = exceptions.filter(actual_date__lte=last_date)
+
+    if exclude_meeting_id:
+        one_offs = one_offs.exclude(meeting_id=exclude_meeting_id)
+        series = series.exclude(pk=exclude_meeting_id)
+        exceptions = exceptions.exclude(meeting_id=exclude_meeting_id)
+
+    if schedule.step is None:
+        bookings = MeetingBooking.objects.filter(
+            user__in=participants,
+            period__overlap=meeting_period(schedule.date, schedule.start_time, schedule.end_time),
+        )
+        if exclude_meeting_id:
+            bookings = bookings.exclude(meeting_id=exclude_meeting_id)
+        if bookings.exists():
+            return True
+    else:
+        for date in one_offs.values_list("date", flat=True).distinct().iterator():
+            if schedule_contains(schedule, date) and date not in schedule.skip_dates:
+                return True
+
+    for date in exceptions.values_list("actual_date", flat=True).distinct().iterator():
+        if schedule_contains(schedule, date) and date not in schedule.skip_dates:
+            return True
+
+    for meeting in series.distinct().prefetch_related("exceptions"):
+        skip_dates = [exception.original_date for exception in meeting.exceptions.all()]
+        if schedules_overlap(schedule, meeting_schedule(meeting, skip_dates)):
+            return True
+
+    return False
+
+
+def occurrence_key(occurrence):
+    """Sort key of occurrences: by time, then by meeting."""
+    return occurrence.date, occurrence.start_time, occurrence.meeting.pk
+
+
+def iter_occurrences(meeting, start=None, end=None):
+    """
+    Lazily yield occurrences of the meeting between start and end dates ordered by time.
+    Without an end date an endless series yields occurrences for as long as they are consumed.
+    Exceptions of recurring meetings should be prefetched.
+    """
+    start = start or datetime.date.min
+    end = end or datetime.date.max
+    if not meeting.is_recurring:
+        if start <= meeting.date <= end:
+            yield Occurrence(meeting, meeting.date, meeting.date, meeting.start_time, meeting.end_time)
+        return
+
+    exceptions = {exception.original_date: exception for exception in meeting.exceptions.all()}
+    regular = (
+        Occurrence(meeting, occurrence_date, occurrence_date, meeting.start_time, meeting.end_time)
+        for occurrence_date in iter_schedule_dates(meeting_schedule(meeting), start, end)
+        if occurrence_date not in exceptions
+    )
+    moved = sorted(
+        (
+            Occurrence(
+                meeting,
+                exception.original_date,
+                exception.date or exception.original_date,
+                exception.start_time or meeting.start_time,
+                exception.end_time or meeting.end_time,
+            )
+            for exception in exceptions.values()
+            if not exception.is_cancelled and start <= (exception.date or exception.original_date) <= end
+        ),
+        key=occurrence_key,
+    )
+    yield from heapq.merge(regular, moved, key=occurrence_key)
+
+
+def expand_occurrences(meetings, start, end):
+    """
+    Expand meetings into their occurrences between start and end dates, ordered by time.
+    Exceptions of recurring meetings should be prefetched.
+    """
+    return list(heapq.merge(*(iter_occurrences(meeting, start, end) for meeting in meetings), key=occurrence_key))
@@ -1,16 +1,33 @@
-from django.db.models import Q
+from datetime import time
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.serializers import ModelSerializer
-from meetings.models import Meeting
+from meetings.models import BOOKING_OVERLAP_CONSTRAINT, Meeting, MeetingException, MeetingRecurrence
+from meetings.recurrence import Schedule, has_conflicting_meetings, meeting_schedule, recurrence_step, schedule_contains
+from users.models import User
+
+OVERLAP_ERROR = "Some participants are already booked for another meeting at this time."
+
+
+def is_overlap_violation(error):
+    """Check whether the integrity error is raised by the booking exclusion constraint."""
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == BOOKING_OVERLAP_CONSTRAINT
 
 
 class MeetingSerializer(ModelSerializer):
     """
     Serializer for Meeting model with validation to ensure:
     start_time is not later than end_time
-    no overlapping meetings for the same participants on the same date and time
+    no overlapping meetings for the same participants on the same date and time,
+    including occurrences of recurring meetings
     """
 
+    # Declared explicitly, DRF makes many-to-many fields with a custom through model read-only.
+    participants = serializers.PrimaryKeyRelatedField(many=True, queryset=User.objects.all())
+
     def validate(self, data):
         """
         Validate that:
@@ -25,6 +42,14 @@ class MeetingSerializer(ModelSerializer):
         start_time = data.get("start_time") or getattr(self.instance, "start_time", None)
         end_time = data.get("end_time") or getattr(self.instance, "end_time", None)
         participants = data.get("participants") or getattr(self.instance, "participants", None)
+        recurrence = data.get("recurrence") or getattr(self.instance, "recurrence", MeetingRecurrence.NONE)
+        recurrence_interval = data.get("recurrence_interval") or getattr(self.instance, "recurrence_interval", 1)
+        recurrence_until = (
+            data["recurrence_until"] if "recurrence_until" in data else getattr(self.instance, "recurrence_until", None)
+        )
+
+        if recurrence_until and date and recurrence_until < date:
+            raise ValidationError("Recurrence end date cannot be earlier than meeting date.")
 
         if hasattr(participants, "all"):
             participants = participants.all()
@@ -33,20 +58,40 @@ class MeetingSerializer(ModelSerializer):
             return data
 
         current_meeting_id = self.instance.id if self.instance else None
+        skip_dates = self.instance.exceptions.values_list("original_date", flat=True) if self.instance else ()
 
-        overlapping_meetings = (
-            Meeting.objects.filter(participants__in=participants, date=date)
-            .filter(Q(start_time__lt=end_time) & Q(end_time__gt=start_time))
-            .distinct()
+        schedule = Schedule(
+            date,
+            start_time,
+            end_time,
+            recurrence_step(recurrence, recurrence_interval),
+            recurrence_until,
+            frozenset(skip_dates),
         )
+        if has_conflicting_meetings(participants, schedule, current_meeting_id):
+            raise ValidationError(OVERLAP_ERROR)
 
-        if current_meeting_id:
-            overlapping_meetings = overlapping_meetings.exclude(id=current_meeting_id)
+        return data
 
-        if overlapping_meetings.exists():
-            raise ValidationError("Some participants are already booked for another meeting at this time.")
+    def create(self, validated_data):
+        """Create the meeting, concurrent overlapping bookings are rejected by the database."""
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as error:
+            if is_overlap_violation(error):
+                raise ValidationError(OVERLAP_ERROR)
+            raise
 
-        return data
+    def update(self, instance, validated_data):
+        """Update the meeting, concurrent overlapping bookings are rejected by the database."""
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as error:
+            if is_overlap_violation(error):
+                raise ValidationError(OVERLAP_ERROR)
+            raise
 
     class Meta:
         model = Meeting
@@ -59,4 +104,143 @@ class MeetingSerializer(ModelSerializer):
             "end_time",
             "organizer",
             "participants",
-        )
\ No newline at end of file
+            "recurrence",
+            "recurrence_interval",
+            "recurrence_until",
+        )
+
+
+class FreeSlotsQuerySerializer(serializers.Serializer):
+    """Serializer for validating query parameters of the free slots search."""
+
+    participants = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    start = serializers.DateField()
+    end = serializers.DateField()
+    duration = serializers.IntegerField(min_value=5, max_value=24 * 60)
+    day_start = serializers.TimeField(default=time(9, 0))
+    day_end = serializers.TimeField(default=time(18, 0))
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate(self, data):
+        """Validate that the search period and the working day are not empty or too long."""
+        if data["start"] > data["end"]:
+            raise ValidationError("Search start date cannot be later than end date.")
+        if (data["end"] - data["start"]).days > 366:
+            raise ValidationError("Search period cannot be longer than a year.")
+        if data["day_start"] >= data["day_end"]:
+            raise ValidationError("Working day start time must be earlier than end time.")
+        return data
+
+
+class MeetingListQuerySerializer(serializers.Serializer):
+    """Serializer for validating the optional from/to window of the meeting list."""
+
+    def get_fields(self):
+        # "from" is a keyword, so the fields cannot be declared as class attributes.
+        return {
+            "from": serializers.DateField(required=False),
+            "to": serializers.DateField(required=False),
+        }
+
+    def validate(self, data):
+        """Validate that the window is not empty."""
+        if "from" in data and "to" in data and data["from"] > data["to"]:
+            raise ValidationError("Start date cannot be later than end date.")
+        return data
+
+
+def serialize_occurrences(occurrences):
+    """Serialize meeting occurrences, every meeting is serialized once and shared by its occurrences."""
+    meetings = {occurrence.meeting.pk: occurrence.meeting for occurrence in occurrences}
+    meetings_data = {meeting["id"]: meeting for meeting in MeetingSerializer(meetings.values(), many=True).data}
+    date_field, time_field = serializers.DateField(), serializers.TimeField()
+
+    return [
+        {
+            **meetings_data[occurrence.meeting.pk],
+            "date": date_field.to_representation(occurrence.date),
+            "start_time": time_field.to_representation(occurrence.start_time),
+            "end_time": time_field.to_representation(occurrence.end_time),
+            "occurrence_date": date_field.to_representation(occurrence.original_date),
+        }
+        for occurrence in occurrences
+    ]
+
+
+class MeetingExceptionSerializer(ModelSerializer):
+    """
+    Serializer for changing a single occurrence of a recurring meeting.
+    The meeting is passed in the context.
+    """
+
+    def validate(self, data):
+        """
+        Validate that:
+        The meeting has an occurrence on the original date
+        The moved occurrence doesn't overlap other meetings of the participants
+        """
+        meeting = self.context["meeting"]
+        if not meeting.is_recurring:
+            raise ValidationError("Only occurrences of a recurring meeting can be changed.")
+        if not schedule_contains(meeting_schedule(meeting), data["original_date"]):
+            raise ValidationError("The meeting has no occurrence on this date.")
+        if data.get("is_cancelled"):
+            return data
+
+        schedule = Schedule(
+            data.get("date") or data["original_date"],
+            data.get("start_time") or meeting.start_time,
+            data.get("end_time") or meeting.end_time,
+            None,
+            None,
+            frozenset(),
+        )
+        if schedule.start_time > schedule.end_time:
+            raise ValidationError("Meeting start time cannot be later than end time.")
+        if has_conflicting_meetings(meeting.participants.all(), schedule, meeting.pk):
+            raise ValidationError(OVERLAP_ERROR)
+
+        return data
+
+    class Meta:
+        model = MeetingException
+        fields = (
+            "id",
+            "original_date",
+            "is_cancelled",
+            "date",
+            "start_time",
+            "end_time",
+        )
+
+
+class MeetingBulkItemSerializer(ModelSerializer):
+    """
+    Serializer for a single meeting of the bulk create request.
+    Participants are plain ids, their existence and overlaps are checked for the whole batch at once.
+    """
+
+    participants = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+    def validate(self, data):
+        """Validate that meeting start_time is not later than end_time."""
+        if data["start_time"] > data["end_time"]:
+            raise ValidationError("Meeting start time cannot be later than end time.")
+        return data
+
+    class Meta:
+        model = Meeting
+        fields = (
+            "title",
+            "description",
+            "date",
+            "start_time",
+            "end_time",
+            "participants",
+        )
+
+
+class MeetingBulkCreateSerializer(serializers.Serializer):
+    """Serializer for validating the body of the bulk create request."""
+
+    meetings = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=1000)
@@ -0,0 +1,193 @@
+import heapq
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Q
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.utils import timezone
+
+from meetings.models import Meeting, MeetingBooking, MeetingParticipant, MeetingRecurrence, meeting_period
+from meetings.recurrence import expand_occurrences, occurs_within
+from meetings.serializers import OVERLAP_ERROR, is_overlap_violation
+from meetings.signals import meetings_bulk_created
+from users.models import User
+
+
+def find_free_slots(participant_ids, start_date, end_date, duration, day_start, day_end, limit):
+    """
+    Return the earliest common free slots of the participants.
+    Meetings of all participants are fetched in one query and expanded into busy intervals
+    within the period, then every day is swept once, moving the cursor past busy intervals.
+    """
+    meetings = (
+        Meeting.objects.filter(
+            Q(participations__user__in=participant_ids)
+            & occurs_within(start_date, end_date, "participations__date")
+        )
+        .distinct()
+        .prefetch_related("exceptions")
+    )
+    busy = sorted(
+        (occurrence.date, occurrence.start_time, occurrence.end_time)
+        for occurrence in expand_occurrences(meetings, start_date, end_date)
+    )
+    busy_by_date = {date: list(intervals) for date, intervals in groupby(busy, key=lambda row: row[0])}
+
+    slots = []
+    date = start_date
+    while date <= end_date and len(slots) < limit:
+        cursor = datetime.combine(date, day_start)
+        closing = datetime.combine(date, day_end)
+
+        for _, start_time, end_time in busy_by_date.get(date, ()):
+            busy_start = min(datetime.combine(date, start_time), closing)
+            while busy_start - cursor >= duration and len(slots) < limit:
+                slots.append((cursor, cursor + duration))
+                cursor += duration
+            cursor = max(cursor, datetime.combine(date, end_time))
+
+        while closing - cursor >= duration and len(slots) < limit:
+            slots.append((cursor, cursor + duration))
+            cursor += duration
+
+        date += timedelta(days=1)
+
+    return slots
+
+
+# A one-off meeting of a participant, as stored on the participants table.
+ParticipantMeeting = namedtuple("ParticipantMeeting", "user_id meeting_id date start_time end_time")
+
+
+def iter_meeting_conflicts(participant_meetings):
+    """
+    Yield every pair of overlapping meetings of the same participant as (earlier, later) pairs.
+    Meetings must be ordered by participant, date and start time. A sweep line keeps only
+    the meetings that have not ended yet in a heap, so memory does not depend on the number of meetings.
+    """
+    day, active = None, []
+    for meeting in participant_meetings:
+        if (meeting.user_id, meeting.date) != day:
+            day, active = (meeting.user_id, meeting.date), []
+        while active and active[0][0] <= meeting.start_time:
+            heapq.heappop(active)
+        if meeting.start_time >= meeting.end_time:
+            continue
+        for _, _, other in sorted(active, key=lambda item: item[1]):
+            yield other, meeting
+        heapq.heappush(active, (meeting.end_time, meeting.start_time, meeting))
+
+
+def _overlaps(period, other):
+    """Check whether two half-open datetime ranges overlap."""
+    return period.lower < other.upper and other.lower < period.upper
+
+
+def bulk_create_meetings(candidates, organizer):
+    """
+    Create valid meetings in bulk.
+    Candidates are (index, validated data) pairs. Participants existence, their bookings and
+    recurring meetings are loaded once for the whole batch, then every candidate is checked
+    against existing meetings and earlier candidates of the batch in memory.
+    Returns created meetings and error messages, both keyed by the candidate index.
+    """
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                return _bulk_create_meetings(candidates, organizer)
+        except IntegrityError as error:
+            # A concurrent request booked the same time after the check, it is visible on retry.
+            if attempt or not is_overlap_violation(error):
+                raise
+
+
+def _bulk_create_meetings(candidates, organizer):
+    created, errors = {}, {}
+    if not candidates:
+        return created, errors
+
+    periods = {
+        index: meeting_period(data["date"], data["start_time"], data["end_time"]) for index, data in candidates
+    }
+    user_ids = {user_id for _, data in candidates for user_id in data["participants"]}
+    existing_user_ids = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+
+    window = DateTimeTZRange(
+        min(period.lower for period in periods.values()),
+        max(period.upper for period in periods.values()),
+    )
+    booked = defaultdict(list)
+    bookings = MeetingBooking.objects.filter(user_id__in=existing_user_ids, period__overlap=window)
+    for user_id, period in bookings.values_list("user_id", "period"):
+        booked[user_id, timezone.localdate(period.lower)].append(period)
+
+    first_date = min(data["date"] for _, data in candidates)
+    last_date = max(data["date"] for _, data in candidates)
+    series = (
+        Meeting.objects.filter(participants__in=existing_user_ids)
+        .exclude(recurrence=MeetingRecurrence.NONE)
+        .filter(occurs_within(first_date, last_date))
+        .distinct()
+        .prefetch_related("exceptions", Prefetch("participants", queryset=User.objects.only("pk")))
+    )
+    for occurrence in expand_occurrences(series, first_date, last_date):
+        period = meeting_period(occurrence.date, occurrence.start_time, occurrence.end_time)
+        for participant in occurrence.meeting.participants.all():
+            booked[participant.pk, occurrence.date].append(period)
+
+    accepted = []
+    for index, data in candidates:
+        period = periods[index]
+        participant_ids = set(data["participants"])
+        unknown_ids = participant_ids - existing_user_ids
+        if unknown_ids:
+            errors[index] = f"Unknown participants: {', '.join(map(str, sorted(unknown_ids)))}."
+            continue
+        if any(
+            _overlaps(period, other)
+            for user_id in participant_ids
+            for other in booked[user_id, data["date"]]
+        ):
+            errors[index] = OVERLAP_ERROR
+            continue
+        for user_id in participant_ids:
+            booked[user_id, data["date"]].append(period)
+        accepted.append((index, data, participant_ids))
+
+    meetings = Meeting.objects.bulk_create(
+        [
+            Meeting(
+                title=data["title"],
+                description=data.get("description"),
+                date=data["date"],
+                start_time=data["start_time"],
+                end_time=data["end_time"],
+                organizer=organizer,
+            )
+            for _, data, _ in accepted
+        ]
+    )
+
+    participants = {}
+    participant_rows, booking_rows = [], []
+    for meeting, (index, _, participant_ids) in zip(meetings, accepted):
+        created[index] = meeting
+        participants[meeting.pk] = sorted(participant_ids)
+        for user_id in participants[meeting.pk]:
+            participant_rows.append(
+                MeetingParticipant(
+                    meeting=meeting,
+                    user_id=user_id,
+                    date=meeting.date,
+                    start_time=meeting.start_time,
+                    end_time=meeting.end_time,
+                )
+            )
+            booking_rows.append(MeetingBooking(meeting=meeting, user_id=user_id, period=periods[index]))
+    MeetingParticipant.objects.bulk_create(participant_rows)
+    MeetingBooking.objects.bulk_create(booking_rows)
+
+    meetings_bulk_created.send(sender=Meeting, meetings=meetings, participants=participants)
+    return created, errors
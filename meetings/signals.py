@@ -0,0 +1,92 @@
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import Signal, receiver
+
+from meetings.models import Meeting, MeetingBooking, MeetingParticipant, MeetingRecurrence
+
+# Sent after meetings are created with bulk_create, which does not send model signals.
+# Arguments: meetings - created Meeting instances, participants - {meeting id: [user ids]}.
+meetings_bulk_created = Signal()
+
+
+@receiver(m2m_changed, sender=MeetingParticipant)
+def sync_participant_schedule(sender, instance, action, reverse, pk_set, **kwargs):
+    """Copy the meeting date and time to participants added with Meeting.participants."""
+    if action != "post_add" or not pk_set:
+        return
+
+    if reverse:
+        meeting = Meeting.objects.filter(pk=OuterRef("meeting_id"))
+        MeetingParticipant.objects.filter(user=instance, meeting_id__in=pk_set).update(
+            date=Subquery(meeting.values("date")[:1]),
+            start_time=Subquery(meeting.values("start_time")[:1]),
+            end_time=Subquery(meeting.values("end_time")[:1]),
+        )
+    else:
+        MeetingParticipant.objects.filter(meeting=instance, user_id__in=pk_set).update(
+            date=instance.date, start_time=instance.start_time, end_time=instance.end_time
+        )
+
+
+@receiver(m2m_changed, sender=MeetingParticipant)
+def sync_meeting_bookings(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep participants bookings in sync with Meeting.participants.
+    Recurring meetings are not booked, their occurrences are checked by their rules.
+    """
+    if not reverse and instance.is_recurring:
+        return
+
+    if action == "post_add":
+        if reverse:
+            bookings = [
+                MeetingBooking(meeting=meeting, user=instance, period=meeting.get_period())
+                for meeting in Meeting.objects.filter(pk__in=pk_set, recurrence=MeetingRecurrence.NONE)
+            ]
+        else:
+            period = instance.get_period()
+            bookings = [MeetingBooking(meeting=instance, user_id=user_id, period=period) for user_id in pk_set]
+        MeetingBooking.objects.bulk_create(bookings)
+
+    elif action == "post_remove":
+        if reverse:
+            MeetingBooking.objects.filter(user=instance, meeting_id__in=pk_set).delete()
+        else:
+            MeetingBooking.objects.filter(meeting=instance, user_id__in=pk_set).delete()
+
+    elif action == "post_clear":
+        if reverse:
+            MeetingBooking.objects.filter(user=instance).delete()
+        else:
+            MeetingBooking.objects.filter(meeting=instance).delete()
+
+
+@receiver(post_save, sender=Meeting)
+def move_meeting_participants(sender, instance, created, **kwargs):
+    """Keep the date and time of participants in sync with the rescheduled meeting."""
+    if created:
+        return
+
+    MeetingParticipant.objects.filter(meeting=instance).update(
+        date=instance.date, start_time=instance.start_time, end_time=instance.end_time
+    )
+
+
+@receiver(post_save, sender=Meeting)
+def move_meeting_bookings(sender, instance, created, **kwargs):
+    """Move participants bookings together with the rescheduled meeting."""
+    if created:
+        return
+
+    bookings = MeetingBooking.objects.filter(meeting=instance)
+    if instance.is_recurring:
+        bookings.delete()
+        return
+
+    period = instance.get_period()
+    if not bookings.update(period=period):
+        # The meeting stopped repeating, its participants have no bookings yet.
+        MeetingBooking.objects.bulk_create(
+            MeetingBooking(meeting=instance, user_id=user_id, period=period)
+            for user_id in instance.participants.values_list("pk", flat=True)
+        )
@@ -1,9 +1,16 @@
+from datetime import timedelta
+
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from meetings.models import Meeting
-from meetings.serializers import MeetingSerializer
+from rest_framework.settings import api_settings
+from meetings.models import Meeting, MeetingException
+from meetings.paginators import OccurrenceCursorPagination
+from meetings.serializers import (FreeSlotsQuerySerializer, MeetingBulkCreateSerializer, MeetingBulkItemSerializer,
+                                  MeetingExceptionSerializer, MeetingListQuerySerializer, MeetingSerializer,
+                                  serialize_occurrences)
+from meetings.services import bulk_create_meetings, find_free_slots
 
 
 class MeetingViewSet(ModelViewSet):
@@ -20,7 +27,86 @@ class MeetingViewSet(ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='my-meetings')
     def my_meetings(self, request):
-        """List all meetings where the current user is a participant."""
-        user_meetings = Meeting.objects.filter(participants=request.user)
-        serializer = self.get_serializer(user_meetings, many=True)
-        return Response(serializer.data)
+        """
+        List occurrences of meetings where the current user is a participant, ordered by date and start time.
+        Recurring meetings are expanded into their occurrences, the list can be limited by from/to dates
+        and is paginated with a cursor.
+        """
+        query = MeetingListQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        paginator = OccurrenceCursorPagination()
+        occurrences = paginator.paginate_occurrences(request.user, request, params.get("from"), params.get("to"))
+        return paginator.get_paginated_response(serialize_occurrences(occurrences))
+
+    @action(detail=True, methods=['post'], url_path='exceptions')
+    def exceptions(self, request, pk=None):
+        """Cancel or move a single occurrence of a recurring meeting."""
+        meeting = self.get_object()
+        serializer = MeetingExceptionSerializer(data=request.data, context={"meeting": meeting})
+        serializer.is_valid(raise_exception=True)
+
+        changes = dict(serializer.validated_data)
+        original_date = changes.pop("original_date")
+        exception, created = MeetingException.objects.update_or_create(
+            meeting=meeting,
+            original_date=original_date,
+            defaults={"is_cancelled": False, "date": None, "start_time": None, "end_time": None, **changes},
+        )
+        return Response(MeetingExceptionSerializer(exception).data, status=201 if created else 200)
+
+    @action(detail=False, methods=['get'], url_path='free-slots')
+    def free_slots(self, request):
+        """Find the earliest time slots when all the given participants are free."""
+        query = FreeSlotsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        slots = find_free_slots(
+            participant_ids=params["participants"],
+            start_date=params["start"],
+            end_date=params["end"],
+            duration=timedelta(minutes=params["duration"]),
+            day_start=params["day_start"],
+            day_end=params["day_end"],
+            limit=params["limit"],
+        )
+        return Response(
+            {
+                "participants": params["participants"],
+                "duration": params["duration"],
+                "slots": [
+                    {"date": start.date(), "start_time": start.time(), "end_time": end.time()}
+                    for start, end in slots
+                ],
+            }
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk-create')
+    def bulk_create(self, request):
+        """Create many meetings at once, invalid meetings are reported without failing the whole batch."""
+        body = MeetingBulkCreateSerializer(data=request.data)
+        body.is_valid(raise_exception=True)
+        items = body.validated_data["meetings"]
+
+        candidates, errors = [], {}
+        for index, item in enumerate(items):
+            serializer = MeetingBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                candidates.append((index, serializer.validated_data))
+            else:
+                errors[index] = serializer.errors
+
+        created, conflicts = bulk_create_meetings(candidates, organizer=request.user)
+        for index, message in conflicts.items():
+            errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+
+        results = [
+            {"index": index, "id": created[index].pk} if index in created else {"index": index, "errors": errors[index]}
+            for index in range(len(items))
+        ]
+        return Response(
+            {"created": len(created), "failed": len(errors), "results": results},
+            status=201 if created else 400,
+        )
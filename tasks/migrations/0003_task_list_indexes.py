@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:47
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes of a large table are built without locking writes.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0002_task_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(fields=["deadline", "id"], name="task_deadline"),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "deadline", "id"], name="task_status_deadline"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["task_performer", "deadline", "id"],
+                name="task_performer_deadline",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["author", "deadline", "id"], name="task_author_deadline"
+            ),
+        ),
+    ]
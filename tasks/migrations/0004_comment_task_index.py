@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:48
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes of a large table are built without locking writes.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0003_task_list_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(
+                fields=["task", "-created_at", "-id"], name="comment_task_created_at"
+            ),
+        ),
+    ]
@@ -1,9 +1,14 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
 from config import settings
 
 NULLABLE = {"blank": True, "null": True}
 
+# Text search configuration used for stemming, follows the language of the project.
+SEARCH_CONFIG = {"ru": "russian", "en": "english"}.get(settings.LANGUAGE_CODE.split("-")[0], "simple")
+
 
 class TaskStatus(models.TextChoices):
     OPEN = "open", "Open"
@@ -22,6 +27,7 @@ class Task(models.Model):
         verbose_name="Статус задачи",
     )
     deadline = models.DateField(verbose_name="Дедлайн")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата изменения")
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -36,10 +42,26 @@ class Task(models.Model):
         verbose_name="Исполнитель, которому назначена задача",
         **NULLABLE,
     )
+    # Stored by the database, so bulk and queryset updates keep it in sync as well as save().
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
+        indexes = [
+            models.Index(fields=["task_performer", "updated_at"], name="task_performer_updated_at"),
+            # Every filter of the task list is followed by the (deadline, id) order of its pages.
+            models.Index(fields=["deadline", "id"], name="task_deadline"),
+            models.Index(fields=["status", "deadline", "id"], name="task_status_deadline"),
+            models.Index(fields=["task_performer", "deadline", "id"], name="task_performer_deadline"),
+            models.Index(fields=["author", "deadline", "id"], name="task_author_deadline"),
+            GinIndex(fields=["search_vector"], name="task_search_vector"),
+        ]
 
     def __str__(self):
         """
@@ -65,11 +87,20 @@ class Comment(models.Model):
         verbose_name="Задача, к которой относится комментарий",
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
+    search_vector = models.GeneratedField(
+        expression=SearchVector("text", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["task", "-created_at", "-id"], name="comment_task_created_at"),
+            GinIndex(fields=["search_vector"], name="comment_search_vector"),
+        ]
 
     def __str__(self):
         """Returns a string representation of the comment instance."""
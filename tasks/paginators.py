@@ -0,0 +1,36 @@
+from datetime import date, datetime
+
+from config.pagination import KeysetPagination
+
+
+class TaskCursorPagination(KeysetPagination):
+    """Tasks ordered by deadline."""
+
+    ordering_field = "deadline"
+
+    def parse_value(self, value):
+        return date.fromisoformat(value)
+
+
+class CommentCursorPagination(KeysetPagination):
+    """Comments from the newest to the oldest."""
+
+    ordering_field = "created_at"
+    descending = True
+
+    def parse_value(self, value):
+        return datetime.fromisoformat(value)
+
+
+class SearchCursorPagination(KeysetPagination):
+    """Search results from the most relevant, the rank is an annotation of the search queryset."""
+
+    ordering_field = "rank"
+    descending = True
+
+    def parse_value(self, value):
+        return float(value)
+
+    def format_value(self, value):
+        # repr() round-trips the float exactly, so the next page starts right after the cursor.
+        return repr(value)
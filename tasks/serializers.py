@@ -1,5 +1,5 @@
 from rest_framework.serializers import ModelSerializer
-from tasks.models import Comment, Task
+from tasks.models import Comment, Task, TaskStatus
 from rest_framework import serializers
 
 
@@ -34,9 +34,73 @@ class CommentSerializer(ModelSerializer):
         )
 
 
+class TaskListQuerySerializer(serializers.Serializer):
+    """Serializer for validating filters of the task list."""
+
+    status = serializers.ChoiceField(choices=TaskStatus.choices, required=False)
+    task_performer = serializers.IntegerField(required=False)
+    author = serializers.IntegerField(required=False)
+    deadline_from = serializers.DateField(required=False)
+    deadline_to = serializers.DateField(required=False)
+
+    def validate(self, data):
+        """Validate that the deadline range is not empty."""
+        if "deadline_from" in data and "deadline_to" in data and data["deadline_from"] > data["deadline_to"]:
+            raise serializers.ValidationError("Deadline range start cannot be later than its end.")
+        return data
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Serializer for validating the search query, the syntax is the one of web search engines."""
+
+    q = serializers.CharField(max_length=200)
+
+
+class TaskSearchSerializer(ModelSerializer):
+    """Serializer for a task found by the search, with its relevance and highlighted fragments."""
+    rank = serializers.FloatField(read_only=True)
+    title_headline = serializers.CharField(read_only=True)
+    description_headline = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Task
+        fields = (
+            "id",
+            "title",
+            "status",
+            "deadline",
+            "task_performer",
+            "rank",
+            "title_headline",
+            "description_headline",
+        )
+
+
+class CommentSearchSerializer(ModelSerializer):
+    """Serializer for a comment found by the search, with its relevance and highlighted fragments."""
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = (
+            "id",
+            "task",
+            "author",
+            "created_at",
+            "rank",
+            "headline",
+        )
+
+
 class TaskDetailSerializer(ModelSerializer):
-    """Detailed serializer for the Task model."""
-    comments = CommentSerializer(many=True, read_only=True)
+    """
+    Detailed serializer for the Task model.
+    Only the latest comments are included, prefetched into latest_comments,
+    all of them are available from the paginated comments of the task.
+    """
+    comments = CommentSerializer(many=True, read_only=True, source="latest_comments")
+    comment_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Task
@@ -48,5 +112,38 @@ class TaskDetailSerializer(ModelSerializer):
             "deadline",
             "author",
             "task_performer",
+            "comment_count",
             "comments",
         )
+
+
+class TaskBulkItemSerializer(ModelSerializer):
+    """
+    Serializer for a single task of the bulk create and update requests.
+    Performers are plain ids, their existence is checked for the whole batch at once.
+    """
+
+    task_performer = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = (
+            "title",
+            "description",
+            "status",
+            "deadline",
+            "task_performer",
+        )
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """Serializer for validating the body of the bulk create and update requests."""
+
+    tasks = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=1000)
+
+
+class TaskBulkStatusSerializer(serializers.Serializer):
+    """Serializer for validating the body of the bulk status transition request."""
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=10000)
+    status = serializers.ChoiceField(choices=TaskStatus.choices)
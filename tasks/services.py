@@ -0,0 +1,139 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from tasks.models import SEARCH_CONFIG, Comment, Task
+from tasks.signals import tasks_bulk_saved
+from users.models import User
+
+
+def _unknown_performers(candidates):
+    """Return ids of performers of the candidates that do not exist, checked with a single query."""
+    performer_ids = {data["task_performer"] for _, data in candidates if data.get("task_performer") is not None}
+    return performer_ids - set(User.objects.filter(pk__in=performer_ids).values_list("pk", flat=True))
+
+
+def _task_fields(data):
+    """Map validated data to model attributes, performers are plain ids."""
+    return {"task_performer_id" if field == "task_performer" else field: value for field, value in data.items()}
+
+
+def bulk_create_tasks(candidates, author):
+    """
+    Create valid tasks in bulk.
+    Candidates are (index, validated data) pairs, performers of the whole batch are checked at once.
+    Returns created tasks and error messages, both keyed by the candidate index.
+    """
+    created, errors = {}, {}
+    unknown_ids = _unknown_performers(candidates)
+    accepted = []
+    for index, data in candidates:
+        if data.get("task_performer") in unknown_ids:
+            errors[index] = f"Unknown performer: {data['task_performer']}."
+            continue
+        accepted.append((index, data))
+
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create([Task(author=author, **_task_fields(data)) for _, data in accepted])
+        tasks_bulk_saved.send(sender=Task, tasks=tasks, previous={})
+
+    for task, (index, _) in zip(tasks, accepted):
+        created[index] = task
+    return created, errors
+
+
+def bulk_update_tasks(candidates):
+    """
+    Update tasks in bulk with a single UPDATE.
+    Candidates are (index, task id, validated data) pairs, tasks and performers are loaded once for the batch.
+    Returns updated tasks and error messages, both keyed by the candidate index.
+    """
+    updated, errors = {}, {}
+    unknown_ids = _unknown_performers([(index, data) for index, _, data in candidates])
+
+    with transaction.atomic():
+        tasks = Task.objects.select_for_update().in_bulk([task_id for _, task_id, _ in candidates])
+        previous = {}
+        fields = set()
+        for index, task_id, data in candidates:
+            task = tasks.get(task_id)
+            if task is None:
+                errors[index] = f"Unknown task: {task_id}."
+                continue
+            if task_id in previous:
+                errors[index] = f"Task {task_id} is updated twice."
+                continue
+            if data.get("task_performer") in unknown_ids:
+                errors[index] = f"Unknown performer: {data['task_performer']}."
+                continue
+
+            previous[task_id] = (task.task_performer_id, task.deadline)
+            for attribute, value in _task_fields(data).items():
+                setattr(task, attribute, value)
+            fields.update(data)
+            task.updated_at = timezone.now()
+            updated[index] = task
+
+        if updated:
+            Task.objects.bulk_update(updated.values(), [*fields, "updated_at"])
+            tasks_bulk_saved.send(sender=Task, tasks=list(updated.values()), previous=previous)
+
+    return updated, errors
+
+
+def set_tasks_status(task_ids, status):
+    """
+    Move tasks to the status with a single UPDATE.
+    Returns ids of updated tasks and ids of tasks that do not exist.
+    """
+    with transaction.atomic():
+        rows = (
+            Task.objects.select_for_update()
+            .filter(pk__in=task_ids)
+            .values_list("pk", "task_performer_id", "deadline")
+        )
+        previous = {task_id: (performer_id, deadline) for task_id, performer_id, deadline in rows}
+        if previous:
+            Task.objects.filter(pk__in=previous).update(status=status, updated_at=timezone.now())
+            tasks = [
+                Task(pk=task_id, task_performer_id=performer_id, deadline=deadline, status=status)
+                for task_id, (performer_id, deadline) in previous.items()
+            ]
+            tasks_bulk_saved.send(sender=Task, tasks=tasks, previous=previous)
+
+    return set(previous), set(task_ids) - set(previous)
+
+
+def _headline(field, query):
+    """Fragments of the field with the matched words highlighted."""
+    return SearchHeadline(field, query, config=SEARCH_CONFIG, start_sel="<b>", stop_sel="</b>", max_fragments=2)
+
+
+def _rank(query):
+    """
+    Relevance of the search vector to the query.
+    It is cast to double precision, as the real returned by ts_rank loses its exact value on the way
+    to Python and the cursor of the next page would not match it.
+    """
+    return Cast(SearchRank(F("search_vector"), query), FloatField())
+
+
+def search_tasks(text):
+    """Tasks matching the search text, annotated with rank and highlights, the match uses the GIN index."""
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    return Task.objects.filter(search_vector=query).annotate(
+        rank=_rank(query),
+        title_headline=_headline("title", query),
+        description_headline=_headline("description", query),
+    )
+
+
+def search_comments(text):
+    """Comments matching the search text, annotated with rank and highlights, the match uses the GIN index."""
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    return Comment.objects.filter(search_vector=query).annotate(
+        rank=_rank(query),
+        headline=_headline("text", query),
+    )
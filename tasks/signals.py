@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after tasks are saved with bulk_create, bulk_update or update, which do not send model signals.
+# Arguments: tasks - saved Task instances, previous - {task id: (performer id, deadline)} of updated tasks.
+tasks_bulk_saved = Signal()
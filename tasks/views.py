@@ -1,15 +1,53 @@
+from django.db.models import Count, Prefetch
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 
 from tasks.models import Task, Comment
-from tasks.serializers import TaskSerializer, TaskDetailSerializer, CommentSerializer
+from tasks.paginators import CommentCursorPagination, SearchCursorPagination, TaskCursorPagination
+from tasks.serializers import (CommentSearchSerializer, CommentSerializer, SearchQuerySerializer,
+                               TaskBulkItemSerializer, TaskBulkSerializer, TaskBulkStatusSerializer,
+                               TaskDetailSerializer, TaskListQuerySerializer, TaskSearchSerializer, TaskSerializer)
+from tasks.services import (bulk_create_tasks, bulk_update_tasks, search_comments, search_tasks,
+                            set_tasks_status)
 from users.permissions import IsManagerPermission
 
 
 class TaskViewSet(ModelViewSet):
-    """ViewSet for handling Task operations."""
+    """
+    ViewSet for handling Task operations.
+    The list is filtered by status, performer, author and deadline range and paginated with a cursor.
+    """
 
     queryset = Task.objects.all()
+    pagination_class = TaskCursorPagination
+    latest_comments_count = 10
+
+    def get_queryset(self):
+        """Apply list filters from the query parameters, load the comment preview for retrieve."""
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            latest_comments = Comment.objects.order_by("-created_at", "-pk")[: self.latest_comments_count]
+            return queryset.annotate(comment_count=Count("comments")).prefetch_related(
+                Prefetch("comments", queryset=latest_comments, to_attr="latest_comments")
+            )
+        if self.action != "list":
+            return queryset
+
+        query = TaskListQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        filters = {
+            "status": "status",
+            "task_performer": "task_performer_id",
+            "author": "author_id",
+            "deadline_from": "deadline__gte",
+            "deadline_to": "deadline__lte",
+        }
+        return queryset.filter(
+            **{lookup: query.validated_data[param] for param, lookup in filters.items() if param in query.validated_data}
+        )
 
     def get_serializer_class(self):
         """Use detail serializer for retrieve action."""
@@ -19,7 +57,9 @@ class TaskViewSet(ModelViewSet):
 
     def get_permissions(self):
         """Set custom permissions per action."""
-        if self.action in ["create", "update", "partial_update", "destroy"]:
+        if self.action in [
+            "create", "update", "partial_update", "destroy", "bulk_create", "bulk_update", "bulk_status"
+        ]:
             return [IsAuthenticated(), IsManagerPermission()]
         return [IsAuthenticated()]
 
@@ -27,6 +67,98 @@ class TaskViewSet(ModelViewSet):
         """Automatically assign the author when creating a task."""
         serializer.save(author=self.request.user)
 
+    @action(detail=True, methods=["get"], url_path="comments")
+    def comments(self, request, pk=None):
+        """List comments of the task from the newest, paginated with a cursor."""
+        task = self.get_object()
+        paginator = CommentCursorPagination()
+        page = paginator.paginate_queryset(Comment.objects.filter(task=task), request, self)
+        return paginator.get_paginated_response(CommentSerializer(page, many=True).data)
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """Full-text search over titles and descriptions, from the most relevant task."""
+        query = SearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        paginator = SearchCursorPagination()
+        page = paginator.paginate_queryset(search_tasks(query.validated_data["q"]), request, self)
+        return paginator.get_paginated_response(TaskSearchSerializer(page, many=True).data)
+
+    @staticmethod
+    def _bulk_response(count, saved, errors, key):
+        """Build the per-item response of a bulk request, invalid items are reported by their index."""
+        results = [
+            {"index": index, "id": saved[index].pk} if index in saved else {"index": index, "errors": errors[index]}
+            for index in range(count)
+        ]
+        return {key: len(saved), "failed": len(errors), "results": results}
+
+    def _validate_bulk_items(self, items, partial=False):
+        """Validate bulk items one by one, return (index, validated data) pairs and errors by index."""
+        candidates, errors = [], {}
+        for index, item in enumerate(items):
+            serializer = TaskBulkItemSerializer(data=item, partial=partial)
+            if serializer.is_valid():
+                candidates.append((index, serializer.validated_data))
+            else:
+                errors[index] = serializer.errors
+        return candidates, errors
+
+    @action(detail=False, methods=["post"], url_path="bulk-create")
+    def bulk_create(self, request):
+        """Create many tasks at once, invalid tasks are reported without failing the whole batch."""
+        body = TaskBulkSerializer(data=request.data)
+        body.is_valid(raise_exception=True)
+        items = body.validated_data["tasks"]
+
+        candidates, errors = self._validate_bulk_items(items)
+        created, failures = bulk_create_tasks(candidates, author=request.user)
+        for index, message in failures.items():
+            errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+
+        return Response(self._bulk_response(len(items), created, errors, "created"), status=201 if created else 400)
+
+    @action(detail=False, methods=["patch"], url_path="bulk-update")
+    def bulk_update(self, request):
+        """Partially update many tasks at once, every item has the id of its task."""
+        body = TaskBulkSerializer(data=request.data)
+        body.is_valid(raise_exception=True)
+        items = body.validated_data["tasks"]
+
+        candidates, errors = self._validate_bulk_items(items, partial=True)
+        task_candidates = []
+        for index, data in candidates:
+            task_id = items[index].get("id")
+            if isinstance(task_id, int):
+                task_candidates.append((index, task_id, data))
+            else:
+                errors[index] = {"id": ["A valid integer is required."]}
+
+        updated, failures = bulk_update_tasks(task_candidates)
+        for index, message in failures.items():
+            errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+
+        return Response(self._bulk_response(len(items), updated, errors, "updated"), status=200 if updated else 400)
+
+    @action(detail=False, methods=["post"], url_path="bulk-status")
+    def bulk_status(self, request):
+        """Move many tasks to a status with a single update."""
+        body = TaskBulkStatusSerializer(data=request.data)
+        body.is_valid(raise_exception=True)
+
+        updated, missing = set_tasks_status(body.validated_data["ids"], body.validated_data["status"])
+        return Response(
+            {
+                "updated": len(updated),
+                "failed": len(missing),
+                "results": [
+                    {"id": task_id} if task_id in updated else {"id": task_id, "errors": ["Unknown task."]}
+                    for task_id in body.validated_data["ids"]
+                ],
+            },
+            status=200 if updated else 400,
+        )
+
 
 class CommentViewSet(ModelViewSet):
     """ViewSet for handling Comment operations."""
@@ -40,4 +172,13 @@ class CommentViewSet(ModelViewSet):
 
     def perform_create(self, serializer):
         """Automatically assign the author when creating a comment."""
-        serializer.save(author=self.request.user)
\ No newline at end of file
+        serializer.save(author=self.request.user)
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """Full-text search over comment texts, from the most relevant comment."""
+        query = SearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        paginator = SearchCursorPagination()
+        page = paginator.paginate_queryset(search_comments(query.validated_data["q"]), request, self)
+        return paginator.get_paginated_response(CommentSearchSerializer(page, many=True).data)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:25
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes of a large table are built without locking writes.
+    atomic = False
+
+    dependencies = [
+        ("teams", "0001_initial"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="team",
+            index=models.Index(fields=["name", "id"], name="team_name_id"),
+        ),
+    ]
@@ -23,6 +23,10 @@ class Team(models.Model):
     class Meta:
         verbose_name = "Команда"
         verbose_name_plural = "Команды"
+        indexes = [
+            # Keyset pagination of the team list by (name, id) reads a range of this index.
+            models.Index(fields=["name", "id"], name="team_name_id"),
+        ]
 
     def __str__(self):
         return f"Team - {self.name} (Admin: {self.team_admin})"
@@ -0,0 +1,16 @@
+from config.pagination import KeysetPagination
+
+
+class TeamCursorPagination(KeysetPagination):
+    """Teams ordered by name."""
+
+    ordering_field = "name"
+
+
+class MemberCursorPagination(KeysetPagination):
+    """Team members ordered by id, which follows the (team, user) index of the membership table."""
+
+    ordering_field = "id"
+
+    def parse_value(self, value):
+        return int(value)
@@ -1,5 +1,13 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 from rest_framework.serializers import ModelSerializer
+from rest_framework.utils.urls import replace_query_param
 from teams.models import Team
+from teams.paginators import MemberCursorPagination
+from users.models import UserRole
 from users.serializers import MemberSerializer
 
 
@@ -18,11 +26,47 @@ class TeamSerializer(ModelSerializer):
         )
 
 
+class TeamListSerializer(TeamSerializer):
+    """
+    Serializer for the team list with the number of members.
+    Member ids are listed only when include_members is set in the context, from prefetched members.
+    """
+
+    member_count = serializers.IntegerField(read_only=True)
+
+    class Meta(TeamSerializer.Meta):
+        fields = TeamSerializer.Meta.fields + ("member_count",)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("include_members"):
+            fields.pop("members")
+        return fields
+
+
+class TeamListQuerySerializer(serializers.Serializer):
+    """Serializer for validating query parameters of the team list."""
+
+    include_members = serializers.BooleanField(default=False)
+
+
+class TeamMembersChangeSerializer(serializers.Serializer):
+    """Serializer for validating the ids of users added to or removed from a team."""
+
+    members = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=10000)
+
+
 class TeamDetailSerializer(ModelSerializer):
-    """Serializer for detailed view of a Team instance."""
+    """
+    Serializer for detailed view of a Team instance.
+    Only the first page of members is included, prefetched into first_members,
+    members_next links to the next page of the members of the team.
+    """
 
     team_admin = MemberSerializer(read_only=True)
-    members = MemberSerializer(many=True, read_only=True)
+    members = MemberSerializer(many=True, read_only=True, source="first_members")
+    member_count = serializers.IntegerField(read_only=True)
+    members_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Team
@@ -32,5 +76,39 @@ class TeamDetailSerializer(ModelSerializer):
             "description",
             "created_at",
             "team_admin",
+            "member_count",
             "members",
-        )
\ No newline at end of file
+            "members_next",
+        )
+
+    def get_members_next(self, team):
+        """Return the link to the members after the first page, if there are any."""
+        if team.member_count <= len(team.first_members):
+            return None
+        url = self.context["request"].build_absolute_uri(reverse("team:team_members", args=(team.pk,)))
+        cursor = MemberCursorPagination().encode_cursor(team.first_members[-1])
+        return replace_query_param(url, MemberCursorPagination.cursor_query_param, cursor)
+
+
+class TeamMemberQuerySerializer(serializers.Serializer):
+    """Serializer for validating filters of the team members."""
+
+    role = serializers.ChoiceField(choices=UserRole.choices, required=False)
+    is_active = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+
+class TeamAvailabilityQuerySerializer(serializers.Serializer):
+    """Serializer for validating query parameters of the team availability matrix."""
+
+    start = serializers.DateField()
+    end = serializers.DateField(required=False)
+    slot = serializers.ChoiceField(choices=[15, 30, 60], default=15)
+
+    def validate(self, data):
+        """Default to a week from the start date and validate that the period is not empty or too long."""
+        data.setdefault("end", data["start"] + timedelta(days=6))
+        if data["start"] > data["end"]:
+            raise ValidationError("Start date cannot be later than end date.")
+        if (data["end"] - data["start"]).days > 30:
+            raise ValidationError("Period cannot be longer than 31 days.")
+        return data
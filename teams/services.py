@@ -0,0 +1,148 @@
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
+
+from meetings.models import Meeting, MeetingParticipant, MeetingRecurrence
+from meetings.recurrence import expand_occurrences, occurs_within
+from tasks.models import Task
+from teams.models import Team
+from users.models import User
+
+
+def busy_slots_mask(start_time, end_time, slot_minutes):
+    """Return the bitmask of the day slots touched by the time interval, bit i is the i-th slot of the day."""
+    start = (start_time.hour * 60 + start_time.minute) // slot_minutes
+    end = -(-(end_time.hour * 60 + end_time.minute) // slot_minutes)
+    if end <= start:
+        return 0
+    return (1 << end) - (1 << start)
+
+
+def build_team_availability(team, start_date, end_date, slot_minutes):
+    """
+    Collect busy slots and task deadlines of all team members for the date range.
+    One-off meetings are read from the participants index, recurring meetings are expanded
+    in memory and tasks are counted by the database, so the number of queries is fixed
+    and does not depend on the team size or the length of the range.
+    Returns members as {"id", "email", "busy": [day bitmask], "deadlines": [tasks due per day]}.
+    """
+    days = (end_date - start_date).days + 1
+    members = list(team.members.order_by("pk").values("id", "email"))
+    member_ids = [member["id"] for member in members]
+    busy = {member_id: [0] * days for member_id in member_ids}
+    deadlines = {member_id: [0] * days for member_id in member_ids}
+
+    one_offs = MeetingParticipant.objects.filter(
+        user__in=member_ids,
+        date__range=(start_date, end_date),
+        meeting__recurrence=MeetingRecurrence.NONE,
+    ).values_list("user_id", "date", "start_time", "end_time")
+    for user_id, date, start_time, end_time in one_offs:
+        busy[user_id][(date - start_date).days] |= busy_slots_mask(start_time, end_time, slot_minutes)
+
+    series = (
+        Meeting.objects.filter(participants__in=member_ids)
+        .exclude(recurrence=MeetingRecurrence.NONE)
+        .filter(occurs_within(start_date, end_date))
+        .distinct()
+        .prefetch_related("exceptions", Prefetch("participants", queryset=User.objects.only("pk")))
+    )
+    for occurrence in expand_occurrences(series, start_date, end_date):
+        mask = busy_slots_mask(occurrence.start_time, occurrence.end_time, slot_minutes)
+        for participant in occurrence.meeting.participants.all():
+            if participant.pk in busy:
+                busy[participant.pk][(occurrence.date - start_date).days] |= mask
+
+    tasks = (
+        Task.objects.filter(task_performer__in=member_ids, deadline__range=(start_date, end_date))
+        .values_list("task_performer", "deadline")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    for user_id, deadline, count in tasks:
+        deadlines[user_id][(deadline - start_date).days] = count
+
+    return [
+        {**member, "busy": busy[member["id"]], "deadlines": deadlines[member["id"]]}
+        for member in members
+    ]
+
+
+def member_count():
+    """
+    Number of members of the outer team counted by a correlated subquery on the (team, user) index,
+    so only the teams of the page are counted instead of joining and grouping all memberships.
+    """
+    memberships = (
+        Team.members.through.objects.filter(team_id=OuterRef("pk"))
+        .order_by()
+        .values("team_id")
+        .annotate(count=Count("user_id"))
+        .values("count")
+    )
+    return Coalesce(Subquery(memberships), 0)
+
+
+def _send_members_changed(team, action, user_ids):
+    """Send a single m2m_changed of the team members for the whole call."""
+    m2m_changed.send(
+        sender=Team.members.through,
+        instance=team,
+        action=action,
+        reverse=False,
+        model=User,
+        pk_set=user_ids,
+        using=team._state.db,
+    )
+
+
+def _lock_team(team):
+    """Lock the team row until the end of the transaction, so membership changes of the team run one at a time."""
+    Team.objects.select_for_update().filter(pk=team.pk).values_list("pk").first()
+
+
+def add_team_members(team, user_ids):
+    """
+    Add users to the team with a single INSERT, users who are already members are skipped by the database.
+    Existing users and their membership are read by one query beforehand, so receivers get one post_add event
+    with the ids of the added users only, like with members.add().
+    Returns the ids of added users and the ids of users that do not exist.
+    """
+    user_ids = set(user_ids)
+    with transaction.atomic():
+        _lock_team(team)
+        users = User.objects.filter(pk__in=user_ids).annotate(
+            is_member=Exists(Team.members.through.objects.filter(team=team, user_id=OuterRef("pk")))
+        )
+        existing_ids, new_ids = set(), set()
+        for user_id, is_member in users.values_list("pk", "is_member"):
+            existing_ids.add(user_id)
+            if not is_member:
+                new_ids.add(user_id)
+        if new_ids:
+            Team.members.through.objects.bulk_create(
+                [Team.members.through(team=team, user_id=user_id) for user_id in new_ids],
+                ignore_conflicts=True,
+            )
+            _send_members_changed(team, "post_add", new_ids)
+    return new_ids, user_ids - existing_ids
+
+
+def remove_team_members(team, user_ids):
+    """
+    Remove users from the team with a single DELETE, ids of users who are not members are ignored.
+    Removed members are read first, receivers get one post_remove event with their ids only.
+    Returns the number of removed members.
+    """
+    with transaction.atomic():
+        _lock_team(team)
+        removed_ids = set(
+            Team.members.through.objects.filter(team=team, user_id__in=set(user_ids)).values_list(
+                "user_id", flat=True
+            )
+        )
+        if removed_ids:
+            Team.members.through.objects.filter(team=team, user_id__in=removed_ids).delete()
+            _send_members_changed(team, "post_remove", removed_ids)
+    return len(removed_ids)
@@ -1,8 +1,8 @@
 from django.urls import path
 from teams.apps import TeamsConfig
-from teams.views import (TeamCreateAPIView, TeamDestroyAPIView,
-                         TeamListAPIView, TeamRetrieveAPIView,
-                         TeamUpdateAPIView)
+from teams.views import (TeamAddMembersAPIView, TeamAvailabilityAPIView, TeamCreateAPIView,
+                         TeamDestroyAPIView, TeamListAPIView, TeamMemberListAPIView,
+                         TeamRemoveMembersAPIView, TeamRetrieveAPIView, TeamUpdateAPIView)
 
 app_name = TeamsConfig.name
 
@@ -10,6 +10,10 @@ urlpatterns = [
     path("create/", TeamCreateAPIView.as_view(), name="create_team"),
     path("teams/", TeamListAPIView.as_view(), name="teams_list"),
     path("retrieve/<int:pk>/", TeamRetrieveAPIView.as_view(), name="retrieve_team"),
+    path("retrieve/<int:pk>/members/", TeamMemberListAPIView.as_view(), name="team_members"),
     path("update/<int:pk>/", TeamUpdateAPIView.as_view(), name="update_team"),
+    path("update/<int:pk>/add-members/", TeamAddMembersAPIView.as_view(), name="add_team_members"),
+    path("update/<int:pk>/remove-members/", TeamRemoveMembersAPIView.as_view(), name="remove_team_members"),
     path("destroy/<int:pk>/", TeamDestroyAPIView.as_view(), name="destroy_team"),
+    path("availability/<int:pk>/", TeamAvailabilityAPIView.as_view(), name="team_availability"),
 ]
@@ -1,8 +1,20 @@
-from rest_framework.generics import (CreateAPIView, DestroyAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView)
+from datetime import timedelta
+
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from rest_framework.generics import (CreateAPIView, DestroyAPIView, GenericAPIView, ListAPIView, RetrieveAPIView,
+                                     UpdateAPIView)
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from teams.models import Team
-from teams.serializers import TeamDetailSerializer, TeamSerializer
+from teams.paginators import MemberCursorPagination, TeamCursorPagination
+from teams.serializers import (TeamAvailabilityQuerySerializer, TeamDetailSerializer, TeamListQuerySerializer,
+                               TeamListSerializer, TeamMemberQuerySerializer, TeamMembersChangeSerializer,
+                               TeamSerializer)
+from teams.services import add_team_members, build_team_availability, member_count, remove_team_members
+from users.models import User
 from users.permissions import IsAdminPermission
+from users.serializers import MemberSerializer
 
 
 class TeamCreateAPIView(CreateAPIView):
@@ -13,18 +25,71 @@ class TeamCreateAPIView(CreateAPIView):
 
 
 class TeamListAPIView(ListAPIView):
-    """List all Team instances."""
+    """
+    List all Team instances with the number of members, paginated with a cursor.
+    Member ids are included with include_members=true and loaded by a single prefetch query.
+    """
 
     queryset = Team.objects.all()
-    serializer_class = TeamSerializer
+    serializer_class = TeamListSerializer
+    pagination_class = TeamCursorPagination
+    include_members = False
+
+    def get_queryset(self):
+        """Count members of every team, prefetch their ids only when they are requested."""
+        queryset = super().get_queryset().annotate(member_count=member_count())
+        if self.include_members:
+            queryset = queryset.prefetch_related(Prefetch("members", queryset=User.objects.only("pk")))
+        return queryset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "include_members": self.include_members}
+
+    def list(self, request, *args, **kwargs):
+        query = TeamListQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        self.include_members = query.validated_data["include_members"]
+        return super().list(request, *args, **kwargs)
 
 
 class TeamRetrieveAPIView(RetrieveAPIView):
-    """Retrieve a single Team instance by ID."""
+    """
+    Retrieve a single Team instance by ID.
+    Only the first page of members is loaded, so the cost does not depend on the size of the team.
+    """
 
     queryset = Team.objects.all()
     serializer_class = TeamDetailSerializer
 
+    def get_queryset(self):
+        """Count members and prefetch the first page of them."""
+        first_members = User.objects.order_by("pk")[: MemberCursorPagination.page_size]
+        return (
+            super()
+            .get_queryset()
+            .select_related("team_admin")
+            .annotate(member_count=member_count())
+            .prefetch_related(Prefetch("members", queryset=first_members, to_attr="first_members"))
+        )
+
+
+class TeamMemberListAPIView(ListAPIView):
+    """Members of a team filtered by role and activity, paginated with a cursor."""
+
+    serializer_class = MemberSerializer
+    pagination_class = MemberCursorPagination
+
+    def get_queryset(self):
+        query = TeamMemberQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        team = get_object_or_404(Team, pk=self.kwargs["pk"])
+        members = User.objects.filter(teams=team)
+        if "role" in query.validated_data:
+            members = members.filter(role=query.validated_data["role"])
+        if query.validated_data["is_active"] is not None:
+            members = members.filter(is_active=query.validated_data["is_active"])
+        return members
+
 
 class TeamUpdateAPIView(UpdateAPIView):
     """Update an existing Team instance. Admin only."""
@@ -34,8 +99,71 @@ class TeamUpdateAPIView(UpdateAPIView):
     permission_classes = [IsAuthenticated, IsAdminPermission]
 
 
+class TeamAddMembersAPIView(GenericAPIView):
+    """Add users to a team without sending the whole member list. Admin only."""
+
+    queryset = Team.objects.all()
+    serializer_class = TeamMembersChangeSerializer
+    permission_classes = [IsAuthenticated, IsAdminPermission]
+
+    def post(self, request, *args, **kwargs):
+        team = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        added, unknown = add_team_members(team, serializer.validated_data["members"])
+        return Response({"team": team.pk, "added": sorted(added), "unknown": sorted(unknown)})
+
+
+class TeamRemoveMembersAPIView(GenericAPIView):
+    """Remove users from a team without sending the whole member list. Admin only."""
+
+    queryset = Team.objects.all()
+    serializer_class = TeamMembersChangeSerializer
+    permission_classes = [IsAuthenticated, IsAdminPermission]
+
+    def post(self, request, *args, **kwargs):
+        team = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        removed = remove_team_members(team, serializer.validated_data["members"])
+        return Response({"team": team.pk, "removed": removed})
+
+
 class TeamDestroyAPIView(DestroyAPIView):
     """Delete a Team instance. Admin only."""
 
     queryset = Team.objects.all()
     permission_classes = [IsAuthenticated, IsAdminPermission]
+
+
+class TeamAvailabilityAPIView(GenericAPIView):
+    """
+    Busy slots and task deadlines of all team members for a period, a week by default.
+    Every member gets one hex bitmask per day, bit i is set when slot i of the day is busy,
+    and the number of tasks due per day.
+    """
+
+    queryset = Team.objects.all()
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        query = TeamAvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start_date, end_date, slot = (query.validated_data[key] for key in ("start", "end", "slot"))
+
+        team = self.get_object()
+        members = build_team_availability(team, start_date, end_date, slot)
+        width = -(-24 * 60 // slot // 4)
+        return Response(
+            {
+                "team": team.pk,
+                "slot": slot,
+                "dates": [start_date + timedelta(days=day) for day in range((end_date - start_date).days + 1)],
+                "members": [
+                    {**member, "busy": [format(mask, f"0{width}x") for mask in member["busy"]]}
+                    for member in members
+                ],
+            }
+        )
@@ -1,7 +1,15 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from calendars.cache import get_calendar_cache
+from calendars.models import CalendarRemoval
+from calendars.sync import SYNC_TOKEN_MAX_AGE
 from meetings.models import Meeting
 from tasks.models import Task
 from users.models import User
@@ -43,6 +51,7 @@ class CalendarTestCase(APITestCase):
         self.meeting.participants.set([self.user, self.manager])
 
         self.url = reverse("calendar:calendar")
+        get_calendar_cache().clear()
 
     def test_calendar_day_view_success(self):
         """tests that the calendar is returned for the day."""
@@ -102,4 +111,195 @@ class CalendarTestCase(APITestCase):
         response = self.client.get(self.url, data)
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(response.data["error"], "Введены неверные параметры.")
\ No newline at end of file
+        self.assertEqual(response.data["error"], "Введены неверные параметры.")
+
+    def test_calendar_month_view_grouped_by_day(self):
+        """Tests that meetings and tasks are placed on their days in the month view."""
+        data = {"view": "month", "month": "2025-06"}
+        response = self.client.get(self.url, data)
+        calendar = response.data["calendar"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(calendar), 30)
+        self.assertEqual(calendar["2025-06-06"]["meetings"][0]["id"], self.meeting.pk)
+        self.assertEqual(calendar["2025-06-06"]["tasks"][0]["id"], self.task.pk)
+        self.assertEqual(calendar["2025-06-07"], {"meetings": [], "tasks": []})
+
+    def test_calendar_month_view_query_count(self):
+        """Tests that the month view takes a fixed number of queries."""
+        for day in range(1, 29):
+            meeting = Meeting.objects.create(
+                title="Daily meeting",
+                date=f"2025-06-{day:02d}",
+                start_time="15:00:00",
+                end_time="16:00:00",
+                organizer=self.manager,
+            )
+            meeting.participants.set([self.user, self.manager])
+
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {"view": "month", "month": "2025-06"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_calendar_sync_returns_changes(self):
+        """Tests that a sync token returns only entries changed or removed after it was issued."""
+        long_ago = timezone.now() - timedelta(hours=1)
+        Meeting.objects.update(updated_at=long_ago)
+        Task.objects.update(updated_at=long_ago)
+        data = {"view": "month", "month": "2025-06"}
+        sync_token = self.client.get(self.url, data).data["sync_token"]
+
+        response = self.client.get(self.url, {**data, "sync_token": sync_token})
+        self.assertEqual(response.data["meetings"], [])
+        self.assertEqual(response.data["tasks"], [])
+        self.assertEqual(response.data["removed"], {"meetings": [], "tasks": []})
+
+        meeting = Meeting.objects.create(
+            title="New meeting",
+            date="2025-06-07",
+            start_time="10:00:00",
+            end_time="11:00:00",
+            organizer=self.manager,
+        )
+        meeting.participants.set([self.user])
+        self.meeting.participants.remove(self.user)
+        self.task.deadline = "2025-07-01"
+        self.task.save()
+
+        response = self.client.get(self.url, {**data, "sync_token": sync_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([meeting["id"] for meeting in response.data["meetings"]], [meeting.pk])
+        self.assertEqual(response.data["removed"], {"meetings": [self.meeting.pk], "tasks": [self.task.pk]})
+
+        response = self.client.get(self.url, {**data, "sync_token": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_prune_calendar_removals(self):
+        """Tests that removals older than the maximum age of a sync token are deleted."""
+        task_id = self.task.pk
+        self.meeting.participants.remove(self.user)
+        self.task.delete()
+        expired = CalendarRemoval.objects.get(entry_type="meeting")
+        CalendarRemoval.objects.filter(pk=expired.pk).update(
+            removed_at=timezone.now() - SYNC_TOKEN_MAX_AGE - timedelta(hours=1)
+        )
+
+        out = StringIO()
+        call_command("prune_calendar_removals", stdout=out)
+
+        self.assertIn("Deleted 1 expired calendar removal(s).", out.getvalue())
+        self.assertEqual(list(CalendarRemoval.objects.values_list("entry_type", "entry_id")), [("task", task_id)])
+
+    def test_calendar_feed(self):
+        """Tests the iCalendar feed of the user and its conditional requests."""
+        self.meeting.recurrence = "weekly"
+        self.meeting.save()
+        self.meeting.exceptions.create(original_date="2025-06-13", is_cancelled=True)
+        feed_url = self.client.get(reverse("calendar:feed_link")).data["url"]
+        self.client.logout()
+
+        response = self.client.get(feed_url)
+        content = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertIn(f"UID:meeting-{self.meeting.pk}@businessmanagement\r\n", content)
+        self.assertIn("DTSTART:20250606T050000Z\r\nDTEND:20250606T060000Z\r\n", content)
+        self.assertIn("RRULE:FREQ=WEEKLY;INTERVAL=1\r\nEXDATE:20250613T050000Z\r\n", content)
+        self.assertIn(f"UID:task-{self.task.pk}@businessmanagement\r\nDTSTAMP:", content)
+        self.assertIn("DUE;VALUE=DATE:20250606\r\n", content)
+        self.assertNotIn(f"UID:task-{self.task_for_manager.pk}@", content)
+
+        response = self.client.get(feed_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.task.delete()
+        response = self.client.get(feed_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse("calendar:feed", args=("invalid",)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_calendar_feed_reset(self):
+        """Tests that a new feed URL revokes the URLs issued before."""
+        feed_link_url = reverse("calendar:feed_link")
+        old_feed_url = self.client.get(feed_link_url).data["url"]
+        self.assertEqual(self.client.get(feed_link_url).data["url"], old_feed_url)
+
+        new_feed_url = self.client.post(feed_link_url).data["url"]
+        self.client.logout()
+
+        self.assertNotEqual(new_feed_url, old_feed_url)
+        self.assertEqual(self.client.get(old_feed_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(new_feed_url).status_code, status.HTTP_200_OK)
+
+
+class CalendarCacheTestCase(APITestCase):
+    """Tests for caching of calendar payloads."""
+
+    def setUp(self):
+        """Environment for the tests."""
+        self.user = User.objects.create(email="user@test.test", role="user")
+        self.manager = User.objects.create(email="manager@test.test", role="manager")
+
+        self.client.force_authenticate(user=self.user)
+
+        self.meeting = Meeting.objects.create(
+            title="Test meeting",
+            date="2025-06-06",
+            start_time="10:00:00",
+            end_time="11:00:00",
+            organizer=self.manager,
+        )
+        self.meeting.participants.set([self.user, self.manager])
+
+        self.url = reverse("calendar:calendar")
+        get_calendar_cache().clear()
+
+    def test_calendar_month_view_cached(self):
+        """Tests that a repeated request is served from the cache."""
+        data = {"view": "month", "month": "2025-06"}
+        self.client.get(self.url, data)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["calendar"]["2025-06-06"]["meetings"]), 1)
+
+    def test_calendar_invalidated_by_meeting_changes(self):
+        """Tests that the cache is invalidated when meetings or participants change."""
+        data = {"view": "month", "month": "2025-06"}
+        self.client.get(self.url, data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meeting.date = "2025-06-07"
+            self.meeting.save()
+        calendar = self.client.get(self.url, data).data["calendar"]
+        self.assertEqual(calendar["2025-06-06"]["meetings"], [])
+        self.assertEqual(len(calendar["2025-06-07"]["meetings"]), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meeting.participants.remove(self.user)
+        calendar = self.client.get(self.url, data).data["calendar"]
+        self.assertEqual(calendar["2025-06-07"]["meetings"], [])
+
+    def test_calendar_invalidated_by_task_changes(self):
+        """Tests that the previous performer's calendar is invalidated when a task is reassigned."""
+        task = Task.objects.create(
+            title="Test task",
+            description="Test description",
+            status="open",
+            deadline="2025-06-06",
+            author=self.manager,
+            task_performer=self.user,
+        )
+        data = {"view": "day", "date": "2025-06-06"}
+        self.assertEqual(len(self.client.get(self.url, data).data["tasks"]), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.task_performer = self.manager
+            task.save()
+
+        self.assertEqual(self.client.get(self.url, data).data["tasks"], [])
@@ -1,10 +1,17 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
-from evaluations.models import Evaluation
+from evaluations.cache import get_evaluation_cache
+from evaluations.models import DailyScore, Evaluation
 from tasks.models import Task
+from teams.models import Team
 from users.models import User
 
 
@@ -139,4 +146,167 @@ Testing the review of the rating list."""
         data = response.json()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(data), 2)
+        self.assertEqual(len(data["results"]), 2)
+
+    def test_evaluation_list_queries_and_pagination(self):
+        """Testing the evaluation list runs a fixed number of queries, its filters and cursor."""
+        for number in range(10):
+            task = Task.objects.create(
+                title=f"Task {number}", description="Description", deadline="2025-06-06",
+                task_performer=User.objects.create(email=f"performer{number}@test.test"),
+            )
+            Evaluation.objects.create(task=task, author=self.manager_role, score=4)
+        url = reverse("evaluation:evaluation-list")
+
+        with self.assertNumQueries(1):
+            data = self.client_1.get(url).json()
+        self.assertEqual(len(data["results"]), 12)
+        self.assertEqual(data["results"][-1]["task_performer"], str(self.user_role))
+
+        ids, next_url = [], url
+        while next_url:
+            data = self.client_1.get(next_url, {"page_size": 5} if not ids else None).json()
+            ids += [evaluation["id"] for evaluation in data["results"]]
+            next_url = data["next"]
+        self.assertEqual(ids, list(Evaluation.objects.order_by("-created_at", "-pk").values_list("pk", flat=True)))
+
+        response = self.client_1.get(url, {"task_performer": self.user_role.pk})
+        self.assertEqual([evaluation["id"] for evaluation in response.json()["results"]], [self.evaluation_1.pk])
+        response = self.client_1.get(url, {"task": self.task_2.pk, "author": self.manager_role.pk})
+        self.assertEqual([evaluation["id"] for evaluation in response.json()["results"]], [self.evaluation_2.pk])
+
+        today = timezone.localdate()
+        response = self.client_1.get(url, {"created_from": today, "created_to": today})
+        self.assertEqual(len(response.json()["results"]), 12)
+        response = self.client_1.get(url, {"created_to": today - timezone.timedelta(days=1)})
+        self.assertEqual(response.json()["results"], [])
+        response = self.client_1.get(url, {"created_from": today, "created_to": today - timezone.timedelta(days=1)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_evaluation_bulk_upsert(self):
+        """Testing evaluations are inserted or updated in bulk with the rejected ones reported."""
+        url = reverse("evaluation:evaluation-bulk-upsert")
+        data = {
+            "evaluations": [
+                {"task": self.task_2.pk, "score": 4, "comment": "Better"},
+                {"task": self.task_3.pk, "score": 2},
+                {"task": self.task_3.pk, "score": 3},
+                {"task": 0, "score": 5},
+                {"task": self.task_1.pk, "score": 9},
+            ]
+        }
+
+        response = self.client_1.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client_2.post(url, data, format="json")
+        body = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((body["inserted"], body["updated"], body["rejected"]), (1, 1, 3))
+        self.assertEqual(body["results"][0], {"index": 0, "id": self.evaluation_2.pk})
+        self.assertEqual(
+            body["results"][2]["errors"]["non_field_errors"],
+            [f"Task {self.task_3.pk} is evaluated twice by author {self.manager_role.pk}."],
+        )
+        self.assertEqual(body["results"][3]["errors"]["non_field_errors"], ["Unknown task: 0."])
+        self.assertIn("score", body["results"][4]["errors"])
+
+        self.evaluation_2.refresh_from_db()
+        self.assertEqual((self.evaluation_2.score, self.evaluation_2.comment), (4, "Better"))
+        today = timezone.localdate()
+        self.assertEqual(DailyScore.objects.get(user=self.user_role, day=today).score_sum, 7)
+        self.assertEqual(DailyScore.objects.get(user=self.manager_role, day=today).score_sum, 4)
+
+    def test_import_evaluations(self):
+        """Testing the import of evaluations from CSV and JSON Lines files in batches."""
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = Path(directory) / "evaluations.csv"
+            csv_path.write_text(
+                "task,author,score,comment\n"
+                f"{self.task_1.pk},{self.manager_role.pk},1,Reviewed again\n"
+                f"{self.task_3.pk},{self.manager_role.pk},4,\n"
+                f"{self.task_3.pk},{self.user_role.pk},5,Self review\n"
+                f"{self.task_2.pk},0,5,\n"
+            )
+            jsonl_path = Path(directory) / "evaluations.jsonl"
+            jsonl_path.write_text(
+                f'{{"task": {self.task_2.pk}, "author": {self.user_role.pk}, "score": 3}}\nnot json\n'
+            )
+
+            out, err = StringIO(), StringIO()
+            call_command("import_evaluations", str(csv_path), "--batch-size", "2", stdout=out, stderr=err)
+            self.assertIn("Inserted 2, updated 1, rejected 1 evaluation(s).", out.getvalue())
+            self.assertIn("Row 4: Unknown author: 0.", err.getvalue())
+
+            out, err = StringIO(), StringIO()
+            call_command("import_evaluations", str(jsonl_path), stdout=out, stderr=err)
+            self.assertIn("Inserted 1, updated 0, rejected 1 evaluation(s).", out.getvalue())
+            self.assertIn("Row 2:", err.getvalue())
+
+        self.evaluation_1.refresh_from_db()
+        self.assertEqual((self.evaluation_1.score, self.evaluation_1.comment), (1, "Reviewed again"))
+        self.assertEqual(Evaluation.objects.count(), 5)
+        self.assertEqual(DailyScore.objects.get(user=self.user_role, day=timezone.localdate()).score_count, 3)
+
+    def test_score_analytics(self):
+        """Testing the score histogram, percentiles and trend for the organization, a user and a team."""
+        url = reverse("evaluation:evaluation-analytics")
+        Evaluation.objects.create(task=self.task_3, author=self.manager_role, score=4)
+        two_months_ago = timezone.now() - timezone.timedelta(days=62)
+        Evaluation.objects.filter(pk=self.evaluation_2.pk).update(created_at=two_months_ago)
+
+        with self.assertNumQueries(2):
+            response = self.client_1.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((data["count"], data["average"]), (3, 4.0))
+        self.assertEqual(data["histogram"], {"1": 0, "2": 0, "3": 1, "4": 1, "5": 1})
+        self.assertEqual(data["percentiles"], {"p25": 3.5, "p50": 4.0, "p75": 4.5, "p90": 4.8})
+        self.assertEqual([row["count"] for row in data["trend"]], [1, 2])
+        self.assertEqual(data["trend"][1]["period"], timezone.localdate().replace(day=1).isoformat())
+
+        data = self.client_1.get(url, {"user": self.user_role.pk, "bucket": "week"}).json()
+        self.assertEqual((data["count"], data["average"]), (2, 4.5))
+        self.assertEqual(len(data["trend"]), 1)
+
+        team = Team.objects.create(name="Team", team_admin=self.manager_role)
+        team.members.add(self.manager_role)
+        data = self.client_1.get(url, {"team": team.pk, "start": timezone.localdate().isoformat()}).json()
+        self.assertEqual(data["count"], 0)
+        self.assertEqual(data["percentiles"]["p50"], None)
+
+    def test_leaderboard(self):
+        """Testing the ranking of performers, its cache and its invalidation."""
+        get_evaluation_cache().clear()
+        url = reverse("evaluation:evaluation-leaderboard")
+        today = timezone.localdate().isoformat()
+
+        response = self.client_1.get(url, {"start": today, "end": today})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"rank": 1, "count_rank": 1, "user_id": self.user_role.pk, "task_performer": self.user_role.email,
+                 "average_score": 5.0, "evaluation_count": 1},
+                {"rank": 2, "count_rank": 1, "user_id": self.manager_role.pk,
+                 "task_performer": self.manager_role.email, "average_score": 3.0, "evaluation_count": 1},
+            ],
+        )
+        with self.assertNumQueries(0):
+            self.client_1.get(url, {"start": today, "end": today})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Evaluation.objects.create(task=self.task_3, author=self.manager_role, score=2)
+        results = self.client_1.get(url, {"start": today, "end": today}).json()["results"]
+        self.assertEqual([(row["rank"], row["user_id"], row["average_score"]) for row in results], [
+            (1, self.user_role.pk, 3.5), (2, self.manager_role.pk, 3.0)
+        ])
+        self.assertEqual([row["count_rank"] for row in results], [1, 2])
+
+        team = Team.objects.create(name="Team", team_admin=self.manager_role)
+        team.members.add(self.manager_role)
+        results = self.client_1.get(url, {"team": team.pk, "limit": 1}).json()["results"]
+        self.assertEqual([(row["rank"], row["user_id"]) for row in results], [(1, self.manager_role.pk)])
+
+        response = self.client_1.get(url, {"start": today, "end": "2000-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
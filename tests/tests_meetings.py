@@ -1,8 +1,15 @@
+from datetime import date, time
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APITestCase
 
-from meetings.models import Meeting
+from meetings.models import Meeting, MeetingBooking, MeetingParticipant
+from meetings.serializers import MeetingSerializer
 from users.models import User
 
 
@@ -133,4 +140,405 @@ class MeetingTestCase(APITestCase):
         data = response.json()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(data), 1)
+        self.assertEqual(len(data["results"]), 1)
+        self.assertIsNone(data["next"])
+
+    def test_user_meeting_list_pagination(self):
+        """Testing that the user's meetings are paginated with a cursor in date and time order."""
+        for day in (9, 7, 8):
+            meeting = Meeting.objects.create(
+                title="Test meeting",
+                date=f"2025-06-{day:02}",
+                start_time="10:00:00",
+                end_time="11:00:00",
+                organizer=self.manager,
+            )
+            meeting.participants.set([self.user])
+        url = reverse("meeting:meeting-my-meetings")
+
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {"page_size": 2, "to": "2025-06-08"})
+        data = response.json()
+        self.assertEqual([meeting["date"] for meeting in data["results"]], ["2025-06-06", "2025-06-07"])
+
+        with self.assertNumQueries(3):
+            response = self.client.get(data["next"])
+        data = response.json()
+        self.assertEqual([meeting["date"] for meeting in data["results"]], ["2025-06-08"])
+        self.assertIsNone(data["next"])
+
+        response = self.client.get(url, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(url, {"from": "2025-06-09", "to": "2025-06-08"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_free_slots(self):
+        """Testing the search of common free slots of the participants."""
+        url = reverse("meeting:meeting-free-slots")
+        data = {
+            "participants": [self.user.pk, self.manager.pk],
+            "start": "2025-06-06",
+            "end": "2025-06-07",
+            "duration": 60,
+            "day_start": "09:00",
+            "day_end": "19:00",
+            "limit": 4,
+        }
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, data)
+        slots = response.json()["slots"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(slot["date"], slot["start_time"], slot["end_time"]) for slot in slots],
+            [
+                ("2025-06-06", "09:00:00", "10:00:00"),
+                ("2025-06-06", "11:00:00", "12:00:00"),
+                ("2025-06-06", "12:00:00", "13:00:00"),
+                ("2025-06-06", "13:00:00", "14:00:00"),
+            ],
+        )
+
+    def test_free_slots_skip_busy_evening(self):
+        """Testing that the slots do not overlap meetings and move to the next day."""
+        url = reverse("meeting:meeting-free-slots")
+        data = {
+            "participants": [self.manager.pk],
+            "start": "2025-06-06",
+            "end": "2025-06-07",
+            "duration": 90,
+            "day_start": "17:00",
+            "day_end": "20:00",
+        }
+
+        response = self.client.get(url, data)
+        slots = response.json()["slots"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(slot["date"], slot["start_time"]) for slot in slots],
+            [("2025-06-07", "17:00:00"), ("2025-06-07", "18:30:00")],
+        )
+
+    def test_free_slots_invalid_period(self):
+        """Testing that the search period is validated."""
+        url = reverse("meeting:meeting-free-slots")
+        data = {
+            "participants": [self.user.pk],
+            "start": "2025-06-07",
+            "end": "2025-06-06",
+            "duration": 30,
+        }
+
+        response = self.client.get(url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_meeting_bulk_create(self):
+        """Testing the bulk creation of meetings with per-item errors."""
+        url = reverse("meeting:meeting-bulk-create")
+        meeting = {
+            "title": "Imported meeting",
+            "date": "2025-06-07",
+            "start_time": "10:00:00",
+            "end_time": "11:00:00",
+            "participants": [self.user.pk, self.manager.pk],
+        }
+        data = {
+            "meetings": [
+                meeting,
+                {**meeting, "start_time": "10:30:00", "end_time": "11:30:00"},
+                {**meeting, "date": "2025-06-06", "participants": [self.user.pk]},
+                {**meeting, "start_time": "12:00:00", "end_time": "11:00:00"},
+                {**meeting, "start_time": "12:00:00", "end_time": "13:00:00", "participants": [0]},
+                {**meeting, "start_time": "12:00:00", "end_time": "13:00:00", "participants": [self.user.pk]},
+            ]
+        }
+
+        with self.assertNumQueries(8):
+            response = self.client.post(url, data, format="json")
+        results = response.json()["results"]
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["created"], 2)
+        self.assertEqual([result["index"] for result in results if "id" in result], [0, 5])
+        self.assertEqual(
+            results[1]["errors"]["non_field_errors"],
+            ["Some participants are already booked for another meeting at this time."],
+        )
+        self.assertIn("non_field_errors", results[2]["errors"])
+        self.assertIn("non_field_errors", results[3]["errors"])
+        self.assertEqual(results[4]["errors"]["non_field_errors"], ["Unknown participants: 0."])
+
+        created = Meeting.objects.get(pk=results[0]["id"])
+        self.assertEqual(created.organizer, self.user)
+        self.assertEqual(set(created.participants.values_list("pk", flat=True)), {self.user.pk, self.manager.pk})
+        self.assertEqual(MeetingBooking.objects.filter(meeting=created).count(), 2)
+
+
+class MeetingBookingTestCase(APITestCase):
+    """Tests for the database-enforced prevention of overlapping meetings."""
+
+    def setUp(self):
+        """Environment for the tests."""
+        self.user = User.objects.create(email="user@test.test", role="user")
+        self.manager = User.objects.create(email="manager@test.test", role="manager")
+
+        self.meeting = Meeting.objects.create(
+            title="Test meeting",
+            date="2025-06-06",
+            start_time="10:00:00",
+            end_time="11:00:00",
+            organizer=self.manager,
+        )
+        self.meeting.participants.set([self.user, self.manager])
+
+    def test_bookings_follow_meeting(self):
+        """Testing that bookings are kept in sync with participants and meeting time."""
+        self.assertEqual(MeetingBooking.objects.filter(meeting=self.meeting).count(), 2)
+
+        self.meeting.start_time = "12:00:00"
+        self.meeting.end_time = "13:00:00"
+        self.meeting.save()
+        self.meeting.participants.remove(self.manager)
+
+        booking = MeetingBooking.objects.get(meeting=self.meeting)
+        self.assertEqual(booking.user, self.user)
+        self.assertEqual(booking.period, self.meeting.get_period())
+
+    def test_participants_follow_meeting(self):
+        """Testing that the date and time stored on participants follow the meeting."""
+        self.meeting.date = "2025-06-10"
+        self.meeting.start_time = "12:00:00"
+        self.meeting.save()
+        other = User.objects.create(email="other@test.test")
+        other.meetings.add(self.meeting)
+
+        self.assertEqual(
+            set(MeetingParticipant.objects.filter(meeting=self.meeting).values_list("user", "date", "start_time")),
+            {
+                (user.pk, date(2025, 6, 10), time(12, 0))
+                for user in (self.user, self.manager, other)
+            },
+        )
+
+    def test_overlapping_booking_rejected_by_database(self):
+        """Testing that the exclusion constraint rejects overlapping meetings of a participant."""
+        meeting = Meeting.objects.create(
+            title="Overlapping meeting",
+            date="2025-06-06",
+            start_time="10:30:00",
+            end_time="11:30:00",
+        )
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            meeting.participants.add(self.user)
+
+        meeting.participants.add(User.objects.create(email="other@test.test"))
+        self.assertEqual(MeetingBooking.objects.filter(meeting=meeting).count(), 1)
+
+    def test_concurrent_overlap_mapped_to_validation_error(self):
+        """Testing that a booking made after validation is reported as a validation error."""
+        serializer = MeetingSerializer(
+            data={
+                "title": "New meeting",
+                "date": "2025-06-06",
+                "start_time": "15:00:00",
+                "end_time": "16:00:00",
+                "participants": [self.user.pk],
+            }
+        )
+        self.assertTrue(serializer.is_valid())
+
+        concurrent_meeting = Meeting.objects.create(
+            title="Concurrent meeting",
+            date="2025-06-06",
+            start_time="15:30:00",
+            end_time="16:30:00",
+        )
+        concurrent_meeting.participants.add(self.user)
+
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        self.assertEqual(Meeting.objects.count(), 2)
+
+
+class RecurringMeetingTestCase(APITestCase):
+    """Tests for recurring meetings."""
+
+    def setUp(self):
+        """Environment for the tests."""
+        self.user = User.objects.create(email="user@test.test", role="user")
+        self.manager = User.objects.create(email="manager@test.test", role="manager")
+
+        self.client.force_authenticate(user=self.user)
+
+        self.stand_up = Meeting.objects.create(
+            title="Weekly stand-up",
+            date="2025-06-02",
+            start_time="10:00:00",
+            end_time="10:30:00",
+            organizer=self.manager,
+            recurrence="weekly",
+        )
+        self.stand_up.participants.set([self.user, self.manager])
+        self.url = reverse("meeting:meeting-list")
+
+    def create_meeting(self, **data):
+        """Create a meeting through the API."""
+        data = {
+            "title": "New meeting",
+            "start_time": "10:00:00",
+            "end_time": "11:00:00",
+            "participants": [self.user.pk],
+            **data,
+        }
+        return self.client.post(self.url, data)
+
+    def test_recurring_meeting_not_booked(self):
+        """Testing that occurrences of a recurring meeting are not stored as bookings."""
+        self.assertFalse(MeetingBooking.objects.filter(meeting=self.stand_up).exists())
+
+    def test_one_off_meeting_conflicts_with_occurrence(self):
+        """Testing that a one-off meeting cannot overlap any occurrence of the series."""
+        response = self.create_meeting(date="2026-03-02")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.create_meeting(date="2026-03-03")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_recurring_meetings_conflicts(self):
+        """Testing that series are checked against series and one-off meetings without expanding them."""
+        response = self.create_meeting(date="2025-06-05", recurrence="daily")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.create_meeting(date="2025-06-03", recurrence="daily", recurrence_until="2025-06-08")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.stand_up.recurrence_interval = 2
+        self.stand_up.save()
+        response = self.create_meeting(date="2025-07-21", recurrence="weekly", recurrence_interval=3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.create_meeting(date="2025-06-09", recurrence="weekly", recurrence_interval=2)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_cancelled_occurrence_frees_time(self):
+        """Testing that a cancelled occurrence does not block other meetings."""
+        url = reverse("meeting:meeting-exceptions", args=(self.stand_up.pk,))
+        response = self.client.post(url, {"original_date": "2025-06-09", "is_cancelled": True})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.create_meeting(date="2025-06-09")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(url, {"original_date": "2025-06-10", "is_cancelled": True})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_occurrences_expanded_in_window(self):
+        """Testing that occurrences are expanded only in the requested window with exceptions applied."""
+        url = reverse("meeting:meeting-exceptions", args=(self.stand_up.pk,))
+        self.client.post(url, {"original_date": "2025-06-09", "is_cancelled": True})
+        self.client.post(url, {"original_date": "2025-06-16", "date": "2025-06-17", "start_time": "12:00:00",
+                               "end_time": "12:30:00"})
+
+        response = self.client.get(reverse("meeting:meeting-my-meetings"), {"from": "2025-06-01", "to": "2025-06-30"})
+        occurrences = [(meeting["date"], meeting["start_time"]) for meeting in response.json()["results"]]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            occurrences,
+            [
+                ("2025-06-02", "10:00:00"),
+                ("2025-06-17", "12:00:00"),
+                ("2025-06-23", "10:00:00"),
+                ("2025-06-30", "10:00:00"),
+            ],
+        )
+
+        calendar = self.client.get(reverse("calendar:calendar"), {"view": "month", "month": "2025-06"}).data
+        self.assertEqual(calendar["calendar"]["2025-06-17"]["meetings"][0]["occurrence_date"], "2025-06-16")
+        self.assertEqual(calendar["calendar"]["2025-06-09"]["meetings"], [])
+
+
+class MeetingConflictAuditTestCase(APITestCase):
+    """Tests for the meeting conflict audit command."""
+
+    def setUp(self):
+        """Legacy meetings stored without validation."""
+        self.user = User.objects.create(email="user@test.test", role="user")
+        self.manager = User.objects.create(email="manager@test.test", role="manager")
+
+        self.meetings = [
+            Meeting.objects.create(title="Meeting", date="2025-06-06", start_time=start_time, end_time=end_time)
+            for start_time, end_time in (
+                ("10:00:00", "12:00:00"),
+                ("10:30:00", "11:00:00"),
+                ("11:30:00", "12:30:00"),
+                ("12:30:00", "13:00:00"),
+            )
+        ]
+        MeetingParticipant.objects.bulk_create(
+            MeetingParticipant(
+                meeting=meeting,
+                user=self.user,
+                date=meeting.date,
+                start_time=meeting.start_time,
+                end_time=meeting.end_time,
+            )
+            for meeting in self.meetings
+        )
+        self.meetings[0].participants.add(self.manager)
+
+    def test_audit_reports_every_overlap(self):
+        """Testing that every pair of overlapping meetings of a participant is reported."""
+        out = StringIO()
+        call_command("audit_meeting_conflicts", stdout=out)
+        lines = out.getvalue().splitlines()
+
+        first, second, third, _ = (meeting.pk for meeting in self.meetings)
+        prefix = f"User {self.user.pk} on 2025-06-06: meeting {first} (10:00-12:00) overlaps"
+        self.assertEqual(
+            lines[1:-1],
+            [f"{prefix} meeting {second} (10:30-11:00)", f"{prefix} meeting {third} (11:30-12:30)"],
+        )
+        self.assertEqual(lines[-1], "Found 2 overlapping meeting(s).")
+
+        out = StringIO()
+        call_command("audit_meeting_conflicts", "--from", "2025-06-07", "--to", "2025-12-31", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "No overlapping meetings found.")
+
+    def test_audit_reports_series_overlaps(self):
+        """Testing that occurrences of recurring meetings, moved ones included, are checked."""
+        series = Meeting.objects.create(
+            title="Weekly", date="2025-05-30", start_time="11:45:00", end_time="12:15:00", recurrence="weekly"
+        )
+        series.participants.add(self.manager)
+        series.exceptions.create(original_date="2025-06-06", is_cancelled=True)
+        series.exceptions.create(original_date="2025-06-13", date="2025-06-14", start_time="09:00:00")
+        daily = Meeting.objects.create(
+            title="Daily",
+            date="2025-06-13",
+            start_time="09:30:00",
+            end_time="10:00:00",
+            recurrence="daily",
+            recurrence_until="2025-06-15",
+        )
+        daily.participants.add(self.manager)
+
+        out = StringIO()
+        call_command("audit_meeting_conflicts", "--from", "2025-06-01", "--to", "2025-06-30", stdout=out)
+        lines = out.getvalue().splitlines()
+
+        self.assertEqual(
+            [line for line in lines if line.startswith(f"User {self.manager.pk} ")],
+            [
+                f"User {self.manager.pk} on 2025-06-14: meeting {series.pk} (09:00-12:15) overlaps "
+                f"meeting {daily.pk} (09:30-10:00)"
+            ],
+        )
+        self.assertEqual(lines[-1], "Found 3 overlapping meeting(s).")
+        out = StringIO()
+        call_command("audit_meeting_conflicts", stdout=out)
+        self.assertTrue(out.getvalue().startswith("Recurring meetings are checked up to "))
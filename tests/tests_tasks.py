@@ -101,7 +101,112 @@ class TaskTestCase(APITestCase):
         data = response.json()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(data), 2)
+        self.assertEqual(len(data["results"]), 2)
+
+    def test_task_list_filters_and_pagination(self):
+        """Testing the task list filters and cursor pagination."""
+        url = reverse("task:task-list")
+        for day in (8, 7, 7):
+            Task.objects.create(
+                title="Other task",
+                description="Other description",
+                deadline=f"2025-06-{day:02}",
+                author=self.manager_role,
+                task_performer=self.user_role,
+            )
+
+        response = self.client_1.get(url, {"task_performer": self.user_role.pk, "page_size": 2})
+        data = response.json()
+        self.assertEqual([task["deadline"] for task in data["results"]], ["2025-06-06", "2025-06-07"])
+
+        with self.assertNumQueries(1):
+            response = self.client_1.get(data["next"])
+        data = response.json()
+        self.assertEqual([task["deadline"] for task in data["results"]], ["2025-06-07", "2025-06-08"])
+        self.assertIsNone(data["next"])
+
+        response = self.client_1.get(url, {"status": "open", "deadline_from": "2025-06-07", "deadline_to": "2025-06-07"})
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        response = self.client_1.get(url, {"deadline_from": "2025-06-08", "deadline_to": "2025-06-07"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_task_search(self):
+        """Testing the ranked full-text search over tasks with stemming and highlights."""
+        in_title = Task.objects.create(title="Sales report", description="Collect the numbers", deadline="2025-06-10")
+        in_description = Task.objects.create(
+            title="Quarter plan", description="Account for sales of the last quarter", deadline="2025-06-10"
+        )
+        url = reverse("task:task-search")
+
+        response = self.client_1.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client_1.get(url, {"q": "sale"})
+        results = response.json()["results"]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task["id"] for task in results], [in_title.pk, in_description.pk])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+        self.assertIn("<b>Sales</b>", results[0]["title_headline"])
+        self.assertIn("<b>sales</b>", results[1]["description_headline"])
+
+        ids, next_url = [], url
+        while next_url:
+            data = self.client_1.get(next_url, {"q": "sale", "page_size": 1} if not ids else None).json()
+            ids += [task["id"] for task in data["results"]]
+            next_url = data["next"]
+        self.assertEqual(ids, [in_title.pk, in_description.pk])
+
+        response = self.client_1.get(url, {"q": "sales -quarters"})
+        self.assertEqual([task["id"] for task in response.json()["results"]], [in_title.pk])
+
+    def test_task_bulk_operations(self):
+        """Testing bulk creation, update and status transition of tasks."""
+        url = reverse("task:task-bulk-create")
+        data = {
+            "tasks": [
+                {"title": "Task 1", "description": "Description", "deadline": "2025-06-10",
+                 "task_performer": self.user_role.pk},
+                {"title": "Task 2", "description": "Description", "deadline": "invalid"},
+                {"title": "Task 3", "description": "Description", "deadline": "2025-06-10", "task_performer": 0},
+            ]
+        }
+
+        response = self.client_1.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        with self.assertNumQueries(4):
+            response = self.client_2.post(url, data, format="json")
+        results = response.json()["results"]
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertIn("deadline", results[1]["errors"])
+        self.assertEqual(results[2]["errors"]["non_field_errors"], ["Unknown performer: 0."])
+        created = Task.objects.get(pk=results[0]["id"])
+        self.assertEqual(created.author, self.manager_role)
+
+        response = self.client_2.patch(
+            reverse("task:task-bulk-update"),
+            {"tasks": [{"id": created.pk, "title": "Renamed"}, {"id": 0, "title": "Missing"}, {"title": "No id"}]},
+            format="json",
+        )
+        results = response.json()["results"]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(results[0], {"index": 0, "id": created.pk})
+        self.assertEqual(results[1]["errors"]["non_field_errors"], ["Unknown task: 0."])
+        self.assertIn("id", results[2]["errors"])
+        created.refresh_from_db()
+        self.assertEqual(created.title, "Renamed")
+
+        with self.assertNumQueries(4):
+            response = self.client_2.post(
+                reverse("task:task-bulk-status"),
+                {"ids": [created.pk, self.task_1.pk, 0], "status": "completed"},
+                format="json",
+            )
+        self.assertEqual(response.json()["updated"], 2)
+        self.assertEqual(response.json()["results"][2], {"id": 0, "errors": ["Unknown task."]})
+        self.assertEqual(Task.objects.filter(status="completed").count(), 2)
 
 
 class CommentTestCase(APITestCase):
@@ -141,6 +246,37 @@ class CommentTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Comment.objects.count(), 2)
 
+    def test_task_comments(self):
+        """Testing the latest comments of the task and the paginated list of all its comments."""
+        comments = [self.comment] + [
+            Comment.objects.create(text=f"Comment {number}", task=self.task) for number in range(12)
+        ]
+        newest_first = [comment.pk for comment in reversed(comments)]
+
+        response = self.client.get(reverse("task:task-detail", args=(self.task.pk,)))
+        data = response.json()
+        self.assertEqual(data["comment_count"], 13)
+        self.assertEqual([comment["id"] for comment in data["comments"]], newest_first[:10])
+
+        url = reverse("task:task-comments", args=(self.task.pk,))
+        ids = []
+        while url:
+            data = self.client.get(url, {"page_size": 5} if not ids else None).json()
+            ids += [comment["id"] for comment in data["results"]]
+            url = data["next"]
+        self.assertEqual(ids, newest_first)
+
+    def test_comment_search(self):
+        """Testing the full-text search over comments."""
+        found = Comment.objects.create(text="Deadlines agreed with the customer", task=self.task)
+
+        response = self.client.get(reverse("task:comment-search"), {"q": "customers"})
+        results = response.json()["results"]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([comment["id"] for comment in results], [found.pk])
+        self.assertEqual(results[0]["task"], self.task.pk)
+        self.assertIn("<b>customer</b>", results[0]["headline"])
+
     def test_comment_retrieve(self):
         """Testing the viewing of a single comment."""
         url = reverse("task:comment-detail", args=(self.comment.pk,))
@@ -1,7 +1,10 @@
+from django.db.models.signals import m2m_changed
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
+from meetings.models import Meeting
+from tasks.models import Task
 from teams.models import Team
 from users.models import User
 
@@ -68,6 +71,35 @@ class TeamTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(data.get("name"), self.team.name)
         self.assertEqual(data.get("members"), expected)
+        self.assertEqual(data.get("member_count"), 2)
+        self.assertIsNone(data.get("members_next"))
+
+    def test_team_members(self):
+        """Testing the team detail carries the first page of members and the rest are paginated."""
+        users = User.objects.bulk_create(
+            User(email=f"member{number}@test.test", role="manager", is_active=number % 2 == 0) for number in range(60)
+        )
+        self.team.members.add(*users)
+
+        with self.assertNumQueries(2):
+            data = self.client_1.get(reverse("team:retrieve_team", args=(self.team.pk,))).json()
+        self.assertEqual(data["member_count"], 62)
+        self.assertEqual(len(data["members"]), 50)
+
+        ids, next_url = [member["id"] for member in data["members"]], data["members_next"]
+        while next_url:
+            data = self.client_1.get(next_url).json()
+            ids += [member["id"] for member in data["results"]]
+            next_url = data["next"]
+        self.assertEqual(ids, sorted([self.user_role.pk, self.admin_role.pk] + [user.pk for user in users]))
+
+        url = reverse("team:team_members", args=(self.team.pk,))
+        response = self.client_1.get(url, {"role": "manager", "is_active": "false"})
+        self.assertEqual([member["id"] for member in response.json()["results"]], [user.pk for user in users[1::2]])
+        response = self.client_1.get(url, {"role": "admin"})
+        self.assertEqual([member["id"] for member in response.json()["results"]], [self.admin_role.pk])
+        response = self.client_1.get(reverse("team:team_members", args=(0,)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_team_update(self):
         """Testing the team's update."""
@@ -83,6 +115,42 @@ class TeamTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(data.get("name"), "Test team updated")
 
+    def test_team_members_add_and_remove(self):
+        """Testing members are added and removed incrementally with a single event per request."""
+        new_user = User.objects.create(email="new@test.test", role="user")
+        url = reverse("team:add_team_members", args=(self.team.pk,))
+        events = []
+
+        def receiver(sender, instance, action, pk_set, **kwargs):
+            events.append((instance.pk, action, pk_set))
+
+        m2m_changed.connect(receiver, sender=Team.members.through)
+        self.addCleanup(m2m_changed.disconnect, receiver, sender=Team.members.through)
+
+        response = self.client_1.post(url, {"members": [new_user.pk]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        with self.assertNumQueries(6):
+            response = self.client_2.post(url, {"members": [new_user.pk, self.user_role.pk, 0]}, format="json")
+        self.assertEqual(response.json(), {"team": self.team.pk, "added": [new_user.pk], "unknown": [0]})
+        self.assertEqual(self.team.members.count(), 3)
+        self.assertEqual(events, [(self.team.pk, "post_add", {new_user.pk})])
+
+        events.clear()
+        response = self.client_2.post(url, {"members": [new_user.pk]}, format="json")
+        self.assertEqual(response.json(), {"team": self.team.pk, "added": [], "unknown": []})
+        self.assertEqual(events, [])
+
+        events.clear()
+        response = self.client_2.post(
+            reverse("team:remove_team_members", args=(self.team.pk,)),
+            {"members": [new_user.pk, self.user_role.pk, 0]},
+            format="json",
+        )
+        self.assertEqual(response.json(), {"team": self.team.pk, "removed": 2})
+        self.assertEqual(list(self.team.members.all()), [self.admin_role])
+        self.assertEqual(events, [(self.team.pk, "post_remove", {new_user.pk, self.user_role.pk})])
+
     def test_team_delete(self):
         """Testing the removal of the command."""
         url = reverse("team:destroy_team", args=(self.team.pk,))
@@ -102,5 +170,61 @@ class TeamTestCase(APITestCase):
         data = response.json()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(data), 1)
-        self.assertEqual(type(data), list)
+        self.assertEqual(len(data["results"]), 1)
+        self.assertEqual(data["results"][0]["member_count"], 2)
+        self.assertNotIn("members", data["results"][0])
+
+    def test_team_list_queries_and_pagination(self):
+        """Testing the team list runs a constant number of queries and is paginated by name."""
+        for number in range(5):
+            team = Team.objects.create(name=f"Team | {number}")
+            team.members.set([self.user_role])
+        url = reverse("team:teams_list")
+
+        with self.assertNumQueries(1):
+            response = self.client_1.get(url)
+        self.assertEqual(len(response.json()["results"]), 6)
+
+        with self.assertNumQueries(2):
+            response = self.client_1.get(url, {"include_members": "true"})
+        results = response.json()["results"]
+        self.assertEqual(results[-1]["name"], "Test team")
+        self.assertEqual(sorted(results[-1]["members"]), sorted([self.user_role.pk, self.admin_role.pk]))
+        self.assertEqual(results[0]["members"], [self.user_role.pk])
+
+        names, next_url = [], url
+        while next_url:
+            data = self.client_1.get(next_url, {"page_size": 2} if not names else None).json()
+            names += [team["name"] for team in data["results"]]
+            next_url = data["next"]
+        self.assertEqual(names, [f"Team | {number}" for number in range(5)] + ["Test team"])
+
+    def test_team_availability(self):
+        """Testing the busy slots matrix of the team members."""
+        meeting = Meeting.objects.create(
+            title="Test meeting", date="2025-06-02", start_time="10:00:00", end_time="11:10:00"
+        )
+        meeting.participants.set([self.user_role])
+        stand_up = Meeting.objects.create(
+            title="Stand-up", date="2025-06-03", start_time="00:00:00", end_time="00:30:00", recurrence="daily"
+        )
+        stand_up.participants.set([self.user_role, self.admin_role])
+        Task.objects.create(
+            title="Test task", deadline="2025-06-04", author=self.admin_role, task_performer=self.user_role
+        )
+        url = reverse("team:team_availability", args=(self.team.pk,))
+
+        with self.assertNumQueries(7):
+            response = self.client_1.get(url, {"start": "2025-06-02"})
+        data = response.json()
+        user, admin = sorted(data["members"], key=lambda member: member["id"] != self.user_role.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(data["dates"]), 7)
+        self.assertEqual(user["busy"][0], format(0b11111 << 40, "024x"))
+        self.assertEqual(user["busy"][1:], ["000000000000000000000003"] * 6)
+        self.assertEqual(admin["busy"], ["0" * 24] + ["000000000000000000000003"] * 6)
+        self.assertEqual(user["deadlines"], [0, 0, 1, 0, 0, 0, 0])
+
+        response = self.client_1.get(url, {"start": "2025-06-02", "end": "2025-08-02"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
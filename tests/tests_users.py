@@ -3,8 +3,10 @@ from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from evaluations.models import Evaluation
+from evaluations.models import DailyScore, Evaluation
 from tasks.models import Task
+from tasks.services import bulk_update_tasks
+from teams.models import Team
 from users.models import User
 
 
@@ -160,3 +162,62 @@ class UserAverageScoreTestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(data.get("average_score"), 4)
+
+    def test_user_average_score_rollup(self):
+        """Testing the daily rollup follows evaluation changes and task reassignments."""
+        url = reverse("user:user_average_score", args=(self.user.pk,))
+        today = timezone.localdate()
+
+        def average(**params):
+            return self.client.get(url, params).json()["average_score"]
+
+        self.assertEqual(DailyScore.objects.get(user=self.user, day=today).score_count, 2)
+        with self.assertNumQueries(2):
+            self.assertEqual(average(start=today.isoformat(), end=today.isoformat()), 4)
+        self.assertIsNone(average(start=(today + timezone.timedelta(days=1)).isoformat()))
+
+        self.evaluation_2.score = 4
+        self.evaluation_2.save()
+        self.assertEqual(average(), 4.5)
+
+        self.task_1.task_performer = self.user
+        self.task_1.save()
+        self.assertEqual(average(), 3.67)
+
+        bulk_update_tasks([(0, self.task_3.pk, {"task_performer": self.manager.pk})])
+        self.assertEqual(average(), 3)
+
+        self.task_2.delete()
+        self.assertEqual(average(), 2)
+        self.evaluation_1.delete()
+        self.assertIsNone(average())
+        self.assertEqual(DailyScore.objects.get(user=self.manager, day=today).score_sum, 5)
+
+    def test_user_average_score_batch(self):
+        """Testing the average scores of many users with a single request."""
+        url = reverse("user:user_average_score_batch")
+        today = timezone.localdate().isoformat()
+
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                url, {"users": [self.manager.pk, self.user.pk, 0], "start": today, "end": today}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["period"], {"start": today, "end": today})
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"user_id": self.manager.pk, "task_performer": self.manager.email, "average_score": 2.0},
+                {"user_id": self.user.pk, "task_performer": self.user.email, "average_score": 4.0},
+            ],
+        )
+
+        team = Team.objects.create(name="Team", team_admin=self.manager)
+        team.members.add(self.user)
+        response = self.client.post(url, {"team": team.pk, "start": "2000-01-01", "end": "2000-01-31"}, format="json")
+        self.assertEqual(response.json()["results"], [
+            {"user_id": self.user.pk, "task_performer": self.user.email, "average_score": None}
+        ])
+
+        response = self.client.post(url, {"users": [self.user.pk], "team": team.pk}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -44,3 +44,18 @@ class MemberSerializer(serializers.ModelSerializer):
             "role",
             "is_active",
         )
+
+
+class AverageScoreBatchSerializer(serializers.Serializer):
+    """Serializer for validating a batch average score request, users are given by their ids or by a team."""
+
+    users = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000, required=False)
+    team = serializers.IntegerField(required=False)
+    start = serializers.DateField(required=False, allow_null=True)
+    end = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, data):
+        """Validate that exactly one of users and team is given."""
+        if ("users" in data) == ("team" in data):
+            raise serializers.ValidationError("Either users or team must be given.")
+        return data
@@ -2,7 +2,8 @@ from django.urls import path
 from rest_framework_simplejwt.views import (TokenObtainPairView, TokenRefreshView)
 from rest_framework.permissions import AllowAny
 from users.apps import UsersConfig
-from users.views import (UserCreateAPIView, UserDeleteAPIView, UserListAPIView, UserUpdateAPIView, UserAverageScoreView)
+from users.views import (UserCreateAPIView, UserDeleteAPIView, UserListAPIView, UserUpdateAPIView, UserAverageScoreView,
+                         UserAverageScoreBatchView)
 
 app_name = UsersConfig.name
 
@@ -16,4 +17,5 @@ urlpatterns = [
     path("login/", TokenObtainPairView.as_view(permission_classes=(AllowAny,)), name="login"),
     path("token/refresh/", TokenRefreshView.as_view(permission_classes=(AllowAny,)), name="token_refresh"),
     path("average-score/<int:pk>/", UserAverageScoreView.as_view(), name="user_average_score"),
+    path("average-score/batch/", UserAverageScoreBatchView.as_view(), name="user_average_score_batch"),
 ]
@@ -1,12 +1,14 @@
-from django.db.models import Avg
-from rest_framework.generics import CreateAPIView, ListAPIView, UpdateAPIView, DestroyAPIView, RetrieveAPIView
+from django.shortcuts import get_object_or_404
+from rest_framework.generics import (CreateAPIView, GenericAPIView, ListAPIView, UpdateAPIView, DestroyAPIView,
+                                     RetrieveAPIView)
+from teams.models import Team
 from users.models import User
-from users.serializers import UserSerializer
+from users.serializers import AverageScoreBatchSerializer, UserSerializer
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from users.permissions import IsOwnerPermission
 from rest_framework.response import Response
 from django.utils.dateparse import parse_date
-from evaluations.models import Evaluation
+from evaluations.services import average_scores
 
 
 class UserCreateAPIView(CreateAPIView):
@@ -34,7 +36,10 @@ class UserDeleteAPIView(DestroyAPIView):
 
 
 class UserAverageScoreView(RetrieveAPIView):
-    """A view to get the average score of the user."""
+    """
+    A view to get the average score of the user.
+    The average is computed from the daily rollup of the scores, start and end days are included.
+    """
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -42,23 +47,46 @@ class UserAverageScoreView(RetrieveAPIView):
     def get(self, request, *args, **kwargs):
         user = self.get_object()
 
-        start = parse_date(request.query_params.get("start"))
-        end = parse_date(request.query_params.get("end"))
+        start = parse_date(request.query_params.get("start", ""))
+        end = parse_date(request.query_params.get("end", ""))
 
-        evaluations = Evaluation.objects.filter(task__task_performer=user)
+        return Response(
+            {
+                "user_id": user.id,
+                "task_performer": user.email,
+                "average_score": average_scores([user.pk], start, end).get(user.pk),
+                "period": {"start": start, "end": end},
+            }
+        )
+
+
+class UserAverageScoreBatchView(GenericAPIView):
+    """
+    A view to get the average scores of many users at once, given by their ids or by a team.
+    The period and rounding are the ones of UserAverageScoreView, all averages come from a single query.
+    """
 
-        if start:
-            evaluations = evaluations.filter(created_at__gte=start)
-        if end:
-            evaluations = evaluations.filter(created_at__lte=end)
+    serializer_class = AverageScoreBatchSerializer
 
-        avg_score = evaluations.aggregate(avg=Avg("score"))["avg"]
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        start, end = serializer.validated_data.get("start"), serializer.validated_data.get("end")
+
+        if "team" in serializer.validated_data:
+            users = get_object_or_404(Team, pk=serializer.validated_data["team"]).members.order_by("pk")
+        else:
+            order = {user_id: index for index, user_id in enumerate(serializer.validated_data["users"])}
+            users = sorted(User.objects.filter(pk__in=order), key=lambda user: order[user.pk])
+        users = list(users)
+        averages = average_scores(users, start, end)
 
         return Response(
             {
-                "user_id": user.id,
-                "task_performer": user.email,
-                "average_score": round(avg_score, 2) if avg_score else None,
                 "period": {"start": start, "end": end},
+                "results": [
+                    {"user_id": user.id, "task_performer": user.email, "average_score": averages.get(user.pk)}
+                    for user in users
+                ],
             }
         )